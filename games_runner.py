@@ -0,0 +1,235 @@
+"""
+Game Runner Helpers
+
+Shared helpers for the scripts that run FairGame games: resource paths, the
+FairGame API session, config and template loading, and a runner that plays a
+config locally or through the FairGame API. Game-specific scripts such as
+main.py and public_goods_game_run.py build on these.
+"""
+
+import functools
+import os
+from pathlib import Path
+from typing import Dict, Any
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+
+from src.io_managers.file_manager import FileManager
+
+RESOURCES_PATH = Path("resources")
+TEMPLATES_PATH = RESOURCES_PATH / "game_templates"
+CONFIG_PATH = RESOURCES_PATH / "config"
+RESULTS_PATH = RESOURCES_PATH / "results"
+
+HEADERS = {"Content-Type": "application/json"}
+
+_SESSION = None
+
+
+def get_session() -> requests.Session:
+    """
+    Return the process-wide HTTP session used for FairGame API calls.
+    
+    The session is created on first use and reused afterwards, so repeated
+    runs keep the TCP/TLS connection to the API server alive.
+    
+    Returns:
+        requests.Session: The shared session.
+    """
+    global _SESSION
+    if _SESSION is None:
+        _SESSION = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=8)
+        _SESSION.mount("http://", adapter)
+        _SESSION.mount("https://", adapter)
+    return _SESSION
+
+
+@functools.lru_cache(maxsize=1)
+def load_env_variables() -> str:
+    """
+    Load environment variables and return the FairGame API URL.
+    
+    The .env file is read only on the first call; later calls return the cached URL.
+    
+    Returns:
+        str: The FairGame API URL, defaults to local if not set.
+    """
+    load_dotenv()
+    return os.getenv("FAIRGAME_URL", "http://127.0.0.1:5003/create_and_run_games")
+
+
+class GamesRunner:
+    """
+    Orchestrates the running of games either locally or via API.
+    """
+
+    def __init__(self, call_type: str, config: Dict[str, Any], 
+                 templates: Dict[str, str], fairgame_url: str) -> None:
+        """
+        Initialize the game runner.
+        
+        Args:
+            call_type (str): Type of call ("local" or "api").
+            config (Dict[str, Any]): Game configuration dictionary.
+            templates (Dict[str, str]): Mapping of language -> template text.
+            fairgame_url (str): URL for the FairGame API (if using "api" call_type).
+        """
+        self.call_type = call_type
+        self.config = config
+        self.templates = templates
+        self.fairgame_url = fairgame_url
+
+    def _payload(self) -> Dict[str, Any]:
+        """
+        Build the game request from the config and the templates.
+        
+        The caller's config is left untouched: only the top level is copied,
+        which is enough because games never modify the nested values in place.
+        
+        Returns:
+            Dict[str, Any]: The config with 'promptTemplate' set to the templates.
+        """
+        return {**self.config, "promptTemplate": self.templates}
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Execute the game based on call_type ("local" or "api").
+        
+        Returns:
+            Dict[str, Any]: Results from running the games.
+        
+        Raises:
+            ValueError: If call_type is invalid.
+        """
+        if self.call_type == "local":
+            return self._local_call()
+        elif self.call_type == "api":
+            return self._api_call()
+        else:
+            raise ValueError("Invalid call type. Expected 'local' or 'api'.")
+
+    def _local_call(self) -> Dict[str, Any]:
+        """
+        Execute the game locally using FairGameFactory.
+        
+        Returns:
+            Dict[str, Any]: Game results.
+        """
+        from src.fairgame_factory import FairGameFactory
+        game_factory = FairGameFactory()
+        return game_factory.create_and_run_games(self._payload())
+
+    def _api_call(self) -> Dict[str, Any]:
+        """
+        Execute the game by sending a POST request to the FairGame API.
+        
+        Returns:
+            Dict[str, Any]: Game results from API response.
+        """
+        response = get_session().post(self.fairgame_url, json=self._payload(), headers=HEADERS)
+        return response.json()
+
+
+def load_template_file(template_name: str, language: str) -> str:
+    """
+    Load a game template file based on template name and language.
+    
+    Args:
+        template_name (str): Base name of the template.
+        language (str): Language code (e.g., 'en', 'vn').
+    
+    Returns:
+        str: Template content.
+    """
+    template_filepath = TEMPLATES_PATH / f"{template_name}_{language}.txt"
+    return FileManager.read_template_file(template_filepath)
+
+
+def load_config_file(config_dir: str, config_name: str) -> Dict[str, Any]:
+    """
+    Load a JSON config file for the game.
+    
+    Args:
+        config_dir (str): Directory name under CONFIG_PATH.
+        config_name (str): Config file name without extension.
+    
+    Returns:
+        Dict[str, Any]: Configuration dictionary.
+    """
+    config_filepath = CONFIG_PATH / config_dir / f"{config_name}.json"
+    return FileManager.read_json_file(config_filepath)
+
+
+def load_game_inputs(config_dir: str, config_name: str, template_name: str, language: str) -> tuple:
+    """
+    Load the config and template for a single-language game.
+    
+    Args:
+        config_dir (str): Directory name under CONFIG_PATH.
+        config_name (str): Config file name without extension.
+        template_name (str): Base name of the template.
+        language (str): Language code (e.g., 'en', 'vn').
+    
+    Returns:
+        tuple: (config, templates) where templates maps language -> template text.
+    """
+    config = load_config_file(config_dir, config_name)
+    
+    # Override config to use only the selected language
+    config['languages'] = [language]
+    
+    template_content = load_template_file(template_name, language)
+    return config, {language: template_content}
+
+
+def compute_base_pattern(config: Dict[str, Any], config_name: str, language: str) -> str:
+    """
+    Build the results filename for a config, without the number suffix and extension.
+    
+    The pattern only depends on the config, so batch drivers compute it once
+    and reuse it for every run. Configs without a 'publicGoodsConfig' section
+    are named with cost0 and r0.
+    
+    Args:
+        config (Dict[str, Any]): Game configuration.
+        config_name (str): Base name for the results file.
+        language (str): Language code (e.g., 'en', 'vn').
+    
+    Returns:
+        str: The base filename pattern.
+    """
+    # Extract parameters for filename
+    num_agents = len(config['agents']['names'])
+    num_rounds = config['nRounds']
+    llm_name = config['llm'].lower().replace('openai', '').replace('gpt', 'chatgpt').replace('-', '')
+    
+    # Get contribution cost and multiplication factor from config
+    contribution_cost = int(config.get('publicGoodsConfig', {}).get('contributionCost', 0))
+    multiplication_factor = config.get('publicGoodsConfig', {}).get('multiplicationFactor', 0)
+    # Format multiplication factor as integer if it's a whole number, otherwise 1 decimal
+    r_value = int(multiplication_factor) if multiplication_factor == int(multiplication_factor) else multiplication_factor
+    
+    return f"results_{config_name}_{language}_{num_agents}_agents_{num_rounds}_rounds_{llm_name}_cost{contribution_cost}_r{r_value}"
+
+
+def run_games(call_type: str, config: Dict[str, Any], templates: Dict[str, str],
+              fairgame_url: str) -> Dict[str, Any]:
+    """
+    Run one batch of games.
+    
+    The config is not modified, so callers can reuse the same loaded config
+    across many runs.
+    
+    Args:
+        call_type (str): Type of call ("local" or "api").
+        config (Dict[str, Any]): Game configuration dictionary.
+        templates (Dict[str, str]): Mapping of language -> template text.
+        fairgame_url (str): URL for the FairGame API (if using "api" call_type).
+    
+    Returns:
+        Dict[str, Any]: Results from running the games.
+    """
+    runner = GamesRunner(call_type, config, templates, fairgame_url)
+    return runner.run()
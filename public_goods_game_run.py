@@ -5,105 +5,39 @@ This script runs the Public Goods Game using the FairGame framework.
 It loads the configuration, creates games, runs them, and saves results.
 
 Usage:
-    python public_goods_game_run.py <call_type>
+    python public_goods_game_run.py <call_type> [language] [--config <config_name>]
     
     call_type: 'local' or 'api'
         - local: Runs games locally using FairGameFactory
         - api: Sends request to FairGame API server
+    language: 'en' or 'vn' (default: 'en')
+    --config: Optional config file name (without extension)
 
 Example:
     python public_goods_game_run.py local
 """
 
+import argparse
 import sys
 import os
-from pathlib import Path
 from typing import Dict, Any
-import requests
-from dotenv import load_dotenv
-import glob
 
+try:
+    import fcntl
+except ImportError:  # Windows: counter files are updated without locking
+    fcntl = None
+
+import games_runner
+from games_runner import RESULTS_PATH, compute_base_pattern, load_env_variables, run_games
 from src.io_managers.file_manager import FileManager
 from src.results_processing.results_processor import ResultsProcessor
 
-RESOURCES_PATH = Path("resources")
-TEMPLATES_PATH = RESOURCES_PATH / "game_templates"
-CONFIG_PATH = RESOURCES_PATH / "config"
-RESULTS_PATH = RESOURCES_PATH / "results"
-
-HEADERS = {"Content-Type": "application/json"}
-
-
-def load_env_variables() -> str:
-    """
-    Load environment variables and return the FairGame API URL.
-    
-    Returns:
-        str: The FairGame API URL, defaults to local if not set.
-    """
-    load_dotenv()
-    return os.getenv("FAIRGAME_URL", "http://127.0.0.1:5003/create_and_run_games")
-
-
-class PublicGoodsGameRunner:
-    """
-    Orchestrates the running of Public Goods Games either locally or via API.
-    """
-
-    def __init__(self, call_type: str, config: Dict[str, Any], 
-                 templates: Dict[str, str], fairgame_url: str) -> None:
-        """
-        Initialize the game runner.
-        
-        Args:
-            call_type (str): Type of call ("local" or "api").
-            config (Dict[str, Any]): Game configuration dictionary.
-            templates (Dict[str, str]): Mapping of language -> template text.
-            fairgame_url (str): URL for the FairGame API (if using "api" call_type).
-        """
-        self.call_type = call_type
-        self.config = config
-        self.templates = templates
-        self.config["promptTemplate"] = self.templates
-        self.fairgame_url = fairgame_url
-
-    def run(self) -> Dict[str, Any]:
-        """
-        Execute the game based on call_type ("local" or "api").
-        
-        Returns:
-            Dict[str, Any]: Results from running the games.
-        
-        Raises:
-            ValueError: If call_type is invalid.
-        """
-        if self.call_type == "local":
-            return self._local_call()
-        elif self.call_type == "api":
-            return self._api_call()
-        else:
-            raise ValueError("Invalid call type. Expected 'local' or 'api'.")
-
-    def _local_call(self) -> Dict[str, Any]:
-        """
-        Execute the game locally using FairGameFactory.
-        
-        Returns:
-            Dict[str, Any]: Game results.
-        """
-        from src.fairgame_factory import FairGameFactory
-        game_factory = FairGameFactory()
-        return game_factory.create_and_run_games(self.config)
+CONFIG_DIR_NAME = "public_goods_game"
+DEFAULT_CONFIG_NAME = "public_goods_game_round_known"
+TEMPLATE_NAME = "public_goods_game"
 
-    def _api_call(self) -> Dict[str, Any]:
-        """
-        Execute the game by sending a POST request to the FairGame API.
-        
-        Returns:
-            Dict[str, Any]: Game results from API response.
-        """
-        response = requests.post(self.fairgame_url, json=self.config, headers=HEADERS)
-        return response.json()
+# ResultsProcessor is stateless, so one instance serves every save in the process
+_RESULTS_PROCESSOR = ResultsProcessor()
 
 
 def parse_arguments(argv: list) -> tuple:
@@ -111,61 +45,122 @@ def parse_arguments(argv: list) -> tuple:
     Extract the call type, language, and optional config name from command-line arguments.
     
     Args:
-        argv (list): Command-line arguments.
+        argv (list): Command-line arguments, including the program name.
     
     Returns:
         tuple: (call_type, language, config_name)
     
     Raises:
-        ValueError: If required arguments are not provided.
+        SystemExit: If the arguments are missing or invalid (argparse prints the usage).
     """
-    if len(argv) < 2:
-        raise ValueError("Usage: python public_goods_game_run.py <call_type> [language] [--config <config_name>]\n"
-                        "  call_type: 'local' or 'api'\n"
-                        "  language: 'en' or 'vn' (default: 'en')\n"
-                        "  --config: Optional config file name (without extension)")
-    
-    call_type = argv[1]
-    language = argv[2] if len(argv) > 2 and not argv[2].startswith('--') else 'en'
+    parser = argparse.ArgumentParser(
+        prog="public_goods_game_run.py",
+        description="Run the Public Goods Game locally or through the FairGame API"
+    )
+    parser.add_argument(
+        "call_type",
+        choices=["local", "api"],
+        help="Call type: local or api"
+    )
+    parser.add_argument(
+        "language",
+        nargs="?",
+        default="en",
+        choices=["en", "vn"],
+        help="Language code (default: en)"
+    )
+    parser.add_argument(
+        "--config",
+        default=None,
+        help="Optional config file name (without extension)"
+    )
+    args = parser.parse_args(argv[1:])
+    return args.call_type, args.language, args.config
+
+
+def _scan_next_result_number(base_pattern: str) -> int:
+    """
+    Find the next free number suffix by scanning the results directory.
     
-    # Check for --config flag
-    config_name = None
-    if '--config' in argv:
-        config_idx = argv.index('--config')
-        if config_idx + 1 < len(argv):
-            config_name = argv[config_idx + 1]
+    Args:
+        base_pattern (str): Result filename without the number suffix and extension.
     
-    return call_type, language, config_name
-
-
-def load_template_file(template_name: str, language: str) -> str:
+    Returns:
+        int: One more than the highest existing number (0 if none exist yet).
     """
-    Load a game template file based on template name and language.
+    prefix = f"{base_pattern}_"
+    max_number = -1
+    with os.scandir(RESULTS_PATH) as entries:
+        for entry in entries:
+            name = entry.name
+            if not (name.startswith(prefix) and name.endswith(".csv")):
+                continue
+            # Extract the number at the end
+            number_part = name[len(prefix):-len(".csv")]
+            if number_part.isdigit():
+                max_number = max(max_number, int(number_part))
+    return max_number + 1
+
+
+def next_result_number(base_pattern: str) -> int:
+    """
+    Reserve the next free number suffix for result files sharing a base pattern.
+    
+    The next number is kept in a small '.<base_pattern>.next' counter file in the
+    results directory, so saving doesn't enumerate the directory. The counter is
+    seeded by a one-off scan and is locked while updated, which keeps numbers
+    unique across concurrent processes.
     
     Args:
-        template_name (str): Base name of the template.
-        language (str): Language code (e.g., 'en', 'vn').
+        base_pattern (str): Result filename without the number suffix and extension.
     
     Returns:
-        str: Template content.
+        int: The number to use for the next file (0 if none exist yet).
     """
-    template_filepath = TEMPLATES_PATH / f"{template_name}_{language}.txt"
-    return FileManager.read_template_file(template_filepath)
+    RESULTS_PATH.mkdir(parents=True, exist_ok=True)
+    counter_path = RESULTS_PATH / f".{base_pattern}.next"
+    
+    fd = os.open(counter_path, os.O_RDWR | os.O_CREAT, 0o644)
+    with os.fdopen(fd, "r+", encoding="utf-8") as counter_file:
+        if fcntl is not None:
+            fcntl.flock(counter_file, fcntl.LOCK_EX)
+        
+        content = counter_file.read().strip()
+        next_number = int(content) if content.isdigit() else _scan_next_result_number(base_pattern)
+        # Never hand out a number whose file already exists (e.g. saved by an older version)
+        while (RESULTS_PATH / f"{base_pattern}_{next_number}.csv").exists():
+            next_number += 1
+        
+        counter_file.seek(0)
+        counter_file.truncate()
+        counter_file.write(str(next_number + 1))
+        counter_file.flush()
+        os.fsync(counter_file.fileno())
+    
+    return next_number
 
 
-def load_config_file(config_dir: str, config_name: str) -> Dict[str, Any]:
+def save_results_with_pattern(results: Dict[str, Any], base_pattern: str) -> str:
     """
-    Load a JSON config file for the game.
+    Convert results to a DataFrame and save as CSV named after a precomputed base pattern.
     
     Args:
-        config_dir (str): Directory name under CONFIG_PATH.
-        config_name (str): Config file name without extension.
+        results (Dict[str, Any]): Game results to save.
+        base_pattern (str): Filename pattern from compute_base_pattern.
     
     Returns:
-        Dict[str, Any]: Configuration dictionary.
+        str: The filename that was saved.
     """
-    config_filepath = CONFIG_PATH / config_dir / f"{config_name}.json"
-    return FileManager.read_json_file(config_filepath)
+    df = _RESULTS_PROCESSOR.process(results)
+    
+    next_number = next_result_number(base_pattern)
+    
+    # Create final filename with number
+    filename = f"{base_pattern}_{next_number}.csv"
+    results_filepath = RESULTS_PATH / filename
+    FileManager.save_results_csv(df, results_filepath)
+    
+    return filename
 
 
 def save_results(results: Dict[str, Any], config_name: str, config: Dict[str, Any], language: str) -> str:
@@ -181,48 +176,41 @@ def save_results(results: Dict[str, Any], config_name: str, config: Dict[str, An
     Returns:
         str: The filename that was saved.
     """
-    results_processor = ResultsProcessor()
-    df = results_processor.process(results)
-    
-    # Extract parameters for filename
-    num_agents = len(config['agents']['names'])
-    num_rounds = config['nRounds']
-    llm_name = config['llm'].lower().replace('openai', '').replace('gpt', 'chatgpt').replace('-', '')
-    
-    # Get contribution cost and multiplication factor from config
-    contribution_cost = int(config.get('publicGoodsConfig', {}).get('contributionCost', 0))
-    multiplication_factor = config.get('publicGoodsConfig', {}).get('multiplicationFactor', 0)
-    # Format multiplication factor as integer if it's a whole number, otherwise 1 decimal
-    r_value = int(multiplication_factor) if multiplication_factor == int(multiplication_factor) else multiplication_factor
-    
-    # Base filename pattern without number
-    base_pattern = f"results_{config_name}_{language}_{num_agents}_agents_{num_rounds}_rounds_{llm_name}_cost{contribution_cost}_r{r_value}"
-    
-    # Find existing files with this pattern
-    existing_files = glob.glob(str(RESULTS_PATH / f"{base_pattern}_*.csv"))
+    base_pattern = compute_base_pattern(config, config_name, language)
+    return save_results_with_pattern(results, base_pattern)
+
+
+def load_game_inputs(language: str, config_name: str) -> tuple:
+    """
+    Load the config and template for a single-language Public Goods Game.
     
-    # Extract numbers from existing files
-    max_number = -1
-    for file_path in existing_files:
-        filename = Path(file_path).stem  # Get filename without extension
-        # Extract the number at the end
-        try:
-            number_part = filename.split('_')[-1]
-            number = int(number_part)
-            max_number = max(max_number, number)
-        except (ValueError, IndexError):
-            continue
+    Args:
+        language (str): Language code (e.g., 'en', 'vn').
+        config_name (str): Config file name without extension.
     
-    # Next number is max + 1 (starts at 0 if no files exist)
-    next_number = max_number + 1
+    Returns:
+        tuple: (config, templates) where templates maps language -> template text.
+    """
+    return games_runner.load_game_inputs(CONFIG_DIR_NAME, config_name, TEMPLATE_NAME, language)
+
+
+def run_and_save(call_type: str, config: Dict[str, Any], templates: Dict[str, str],
+                 fairgame_url: str, base_pattern: str) -> str:
+    """
+    Run one batch of games and save the results.
     
-    # Create final filename with number
-    filename = f"{base_pattern}_{next_number}.csv"
-    results_filepath = RESULTS_PATH / filename
-    FileManager.save_results_csv(df, results_filepath)
+    Args:
+        call_type (str): Type of call ("local" or "api").
+        config (Dict[str, Any]): Game configuration dictionary.
+        templates (Dict[str, str]): Mapping of language -> template text.
+        fairgame_url (str): URL for the FairGame API (if using "api" call_type).
+        base_pattern (str): Filename pattern from compute_base_pattern.
     
-    return filename
-
+    Returns:
+        str: The filename that was saved.
+    """
+    results = run_games(call_type, config, templates, fairgame_url)
+    return save_results_with_pattern(results, base_pattern)
 
 
 def main() -> None:
@@ -237,28 +225,13 @@ def main() -> None:
     # Load environment variables
     fairgame_url = load_env_variables()
 
-    # Configuration parameters
-    config_dir = "public_goods_game"
-    config_name = config_name_arg if config_name_arg else "public_goods_game_round_known"
-    template_name = "public_goods_game"
-    
-    # Load config file
-    config = load_config_file(config_dir, config_name)
-    
-    # Override config to use only the selected language
-    config['languages'] = [language]
+    config_name = config_name_arg if config_name_arg else DEFAULT_CONFIG_NAME
+    config, templates = load_game_inputs(language, config_name)
     print(f"DEBUG: Config languages after override: {config['languages']}")
     
-    # Load template for the selected language
-    template_content = load_template_file(template_name, language)
-    templates = {language: template_content}
-    
-    # Create runner and execute
-    runner = PublicGoodsGameRunner(call_type, config, templates, fairgame_url)
-    results = runner.run()
-
-    # Save results and get the actual filename with number
-    saved_filename = save_results(results, config_name, config, language)
+    # Run games and save results, getting the actual filename with number
+    base_pattern = compute_base_pattern(config, config_name, language)
+    saved_filename = run_and_save(call_type, config, templates, fairgame_url, base_pattern)
     
     print(f"\nPublic Goods Game completed successfully!")
     print(f"Language: {language}")
@@ -3,17 +3,22 @@ Reorganize Public Goods Game results into directory structure:
     language/multiplication_factor/model/
 
 Usage:
-    python reorganize_public_goods_results.py [--dry-run]
+    python reorganize_public_goods_results.py [--dry-run] [--quiet]
 """
 
 import argparse
-import shutil
+import os
+import sys
 from pathlib import Path
 import re
-import glob
+from concurrent.futures import ThreadPoolExecutor
 
 RESULTS_PATH = Path("resources/results")
 TARGET_BASE = Path("resources/results")
+RESULT_FILE_PREFIX = "results_public_goods_game_round_known_"
+
+# Number of threads renaming files concurrently
+MOVE_WORKERS = 16
 
 # Model name mapping from filename to directory name
 MODEL_NAME_MAP = {
@@ -22,6 +27,11 @@ MODEL_NAME_MAP = {
     "mistrallarge": "mistralarge"
 }
 
+# Pattern: results_public_goods_game_round_known_<lang>_<n>_agents_<m>_rounds_<model>_cost<cost>_r<r>_<num>.csv
+_FILENAME_RE = re.compile(
+    r"results_public_goods_game_round_known_(\w+)_\d+_agents_\d+_rounds_(\w+)_cost\d+_r([\d.]+)_\d+\.csv"
+)
+
 
 def parse_filename(filename: str) -> dict:
     """
@@ -33,10 +43,7 @@ def parse_filename(filename: str) -> dict:
         dict with keys: language, r_value, model, original_filename
         Returns None if filename doesn't match pattern
     """
-    # Pattern: results_public_goods_game_round_known_<lang>_<n>_agents_<m>_rounds_<model>_cost<cost>_r<r>_<num>.csv
-    pattern = r"results_public_goods_game_round_known_(\w+)_\d+_agents_\d+_rounds_(\w+)_cost\d+_r([\d.]+)_\d+\.csv"
-    
-    match = re.match(pattern, filename)
+    match = _FILENAME_RE.match(filename)
     if not match:
         return None
     
@@ -81,20 +88,48 @@ def get_target_path(language: str, r_value: str, model: str) -> Path:
     return TARGET_BASE / language / r_str / model
 
 
-def organize_results(dry_run: bool = False) -> None:
+def _move_file(move: tuple) -> Exception:
+    """
+    Move one file into its target directory.
+    
+    Args:
+        move: (source path, target directory, filename) tuple
+    
+    Returns:
+        None on success, otherwise the exception raised by the move
+    """
+    file_path, target_dir, filename = move
+    try:
+        # Source and target share the results tree, so a rename suffices
+        os.replace(file_path, target_dir / filename)
+    except Exception as e:
+        return e
+    return None
+
+
+def organize_results(dry_run: bool = False, quiet: bool = False) -> None:
     """
     Organize results files into directory structure.
     
+    Per-file messages are collected and written to stdout in a single call at
+    the end, instead of one print per line.
+    
     Args:
         dry_run: If True, only print what would be done without actually moving files
+        quiet: If True, suppress per-file output and only print the summary
     """
     if not RESULTS_PATH.exists():
         print(f"❌ Results directory not found: {RESULTS_PATH}")
         return
     
     # Find all public goods game result files
-    pattern = str(RESULTS_PATH / "results_public_goods_game_round_known_*.csv")
-    result_files = glob.glob(pattern)
+    with os.scandir(RESULTS_PATH) as entries:
+        result_files = [
+            entry.path for entry in entries
+            if entry.name.startswith(RESULT_FILE_PREFIX)
+            and entry.name.endswith(".csv")
+            and entry.is_file()
+        ]
     
     if not result_files:
         print(f"⚠️  No public goods game result files found in {RESULTS_PATH}")
@@ -105,44 +140,72 @@ def organize_results(dry_run: bool = False) -> None:
     
     if dry_run:
         print("DRY RUN MODE - No files will be moved\n")
+        if quiet:
+            # The dry-run summary only needs the file count
+            print(f"{'='*60}")
+            print(f"Summary: {len(result_files)} files would be organized")
+            return
     
     moved_count = 0
     skipped_count = 0
     error_count = 0
+    lines = []
+    moves = []
     
+    # Group files by target directory so each directory is created only once
+    groups = {}
     for file_path in sorted(result_files):
-        file_path_obj = Path(file_path)
-        filename = file_path_obj.name
+        filename = os.path.basename(file_path)
         
         # Parse filename
         info = parse_filename(filename)
         if not info:
-            print(f"⚠️  Skipping (unrecognized format): {filename}")
+            if not quiet:
+                lines.append(f"⚠️  Skipping (unrecognized format): {filename}\n")
             skipped_count += 1
             continue
         
         # Get target path
         target_dir = get_target_path(info["language"], info["r_value"], info["model"])
-        target_file = target_dir / filename
-        
+        groups.setdefault(target_dir, []).append((file_path, info))
+    
+    for target_dir, files in groups.items():
         if dry_run:
-            print(f"Would move: {filename}")
-            print(f"  From: {file_path_obj}")
-            print(f"  To:   {target_file}")
-            print(f"  Info: lang={info['language']}, r={info['r_value']}, model={info['model']}")
-            print()
+            for file_path, info in files:
+                filename = info["original_filename"]
+                lines.append(
+                    f"Would move: {filename}\n"
+                    f"  From: {file_path}\n"
+                    f"  To:   {target_dir / filename}\n"
+                    f"  Info: lang={info['language']}, r={info['r_value']}, model={info['model']}\n"
+                    "\n"
+                )
+            continue
+        
+        try:
+            # Create target directory
+            target_dir.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            lines.append(f"❌ Error creating {target_dir}: {e}\n")
+            error_count += len(files)
+            continue
+        
+        moves.extend((file_path, target_dir, info["original_filename"]) for file_path, info in files)
+    
+    # All directories exist now; renames are independent, so run them on a thread pool
+    with ThreadPoolExecutor(max_workers=MOVE_WORKERS) as executor:
+        outcomes = list(executor.map(_move_file, moves))
+    
+    for (_, target_dir, filename), error in zip(moves, outcomes):
+        if error is None:
+            if not quiet:
+                lines.append(f"✓ Moved: {filename} -> {target_dir}\n")
+            moved_count += 1
         else:
-            try:
-                # Create target directory
-                target_dir.mkdir(parents=True, exist_ok=True)
-                
-                # Move file
-                shutil.move(str(file_path_obj), str(target_file))
-                print(f"✓ Moved: {filename} -> {target_dir}")
-                moved_count += 1
-            except Exception as e:
-                print(f"❌ Error moving {filename}: {e}")
-                error_count += 1
+            lines.append(f"❌ Error moving {filename}: {error}\n")
+            error_count += 1
+    
+    sys.stdout.writelines(lines)
     
     print(f"{'='*60}")
     if dry_run:
@@ -182,9 +245,15 @@ Example:
         help="Show what would be done without actually moving files"
     )
     
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Suppress per-file output and only print the summary"
+    )
+    
     args = parser.parse_args()
     
-    organize_results(dry_run=args.dry_run)
+    organize_results(dry_run=args.dry_run, quiet=args.quiet)
 
 
 if __name__ == "__main__":
@@ -3,9 +3,15 @@ Run Public Goods Game 10 times consecutively
 Each run will automatically increment the file number
 """
 
-import subprocess
 import sys
 
+from games_runner import compute_base_pattern, load_env_variables
+from public_goods_game_run import (
+    DEFAULT_CONFIG_NAME,
+    load_game_inputs,
+    run_and_save,
+)
+
 def main():
     # Get language from command line argument (default: en)
     language = sys.argv[1] if len(sys.argv) > 1 else 'en'
@@ -13,25 +19,27 @@ def main():
     print(f"Running Public Goods Game 10 times with language: {language}")
     print("=" * 60)
     
+    # Load everything once and reuse it for every run
+    fairgame_url = load_env_variables()
+    config, templates = load_game_inputs(language, DEFAULT_CONFIG_NAME)
+    base_pattern = compute_base_pattern(config, DEFAULT_CONFIG_NAME, language)
+    
     for i in range(1, 5):
         print(f"\n{'='*60}")
         print(f"RUN {i}/10")
         print(f"{'='*60}\n")
         
-        # Run the game
-        result = subprocess.run(
-            ['python', 'public_goods_game_run.py', 'local', language],
-            capture_output=False
-        )
-        
-        if result.returncode != 0:
-            print(f"\n❌ Run {i} failed with exit code {result.returncode}")
+        # Run the game in-process
+        try:
+            saved_filename = run_and_save('local', config, templates, fairgame_url, base_pattern)
+        except Exception as e:
+            print(f"\n❌ Run {i} failed: {e}")
             user_input = input("Continue with next run? (y/n): ")
             if user_input.lower() != 'y':
                 print("Stopping execution.")
                 sys.exit(1)
         else:
-            print(f"\n✓ Run {i} completed successfully")
+            print(f"\n✓ Run {i} completed successfully ({saved_filename})")
     
     print(f"\n{'='*60}")
     print(f"ALL 10 RUNS COMPLETED!")
@@ -2,17 +2,26 @@
 Run Public Goods Game multiple times with specified parameters
 
 Usage:
-    python run_public_goods_with_args.py --num_runs <n> --language <lang> --multiplication_factor <r> --model <model>
+    python run_public_goods_with_args.py --num_runs <n> --language <lang> --multiplication_factor <r> --model <model> [--parallelism <k>]
 
 Example:
     python run_public_goods_with_args.py --num_runs 10 --language en --multiplication_factor 2.0 --model claude
 """
 
 import argparse
-import subprocess
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
+from games_runner import compute_base_pattern, load_env_variables, run_games
+from public_goods_game_run import (
+    load_game_inputs,
+    run_and_save,
+    save_results_with_pattern,
+)
+from src.llm_connectors.backpressure import set_process_count
+
 # Model name mapping
 MODEL_MAP = {
     "claude": "Claude35Haiku",
@@ -41,6 +50,74 @@ def get_config_name(language: str, multiplication_factor: float, model: str) ->
     return f"public_goods_game_{language}_{r_str}_{model}"
 
 
+def _one_run(call_type: str, config: dict, templates: dict, fairgame_url: str) -> dict:
+    """
+    Run a single batch of games in a worker process.
+    
+    Results are returned to the parent instead of being saved here, so the
+    auto-incrementing file number is always assigned by a single process.
+    
+    Returns:
+        Results from running the games.
+    """
+    return run_games(call_type, config, templates, fairgame_url)
+
+
+def run_sequential(args, base_pattern: str, config: dict, templates: dict, fairgame_url: str) -> None:
+    """
+    Execute the runs one after another, asking whether to continue on failure.
+    """
+    for i in range(1, args.num_runs + 1):
+        print(f"\n{'='*60}")
+        print(f"RUN {i}/{args.num_runs}")
+        print(f"{'='*60}\n")
+        
+        # Run the game in-process with the specified config
+        try:
+            saved_filename = run_and_save(args.call_type, config, templates, fairgame_url, base_pattern)
+        except Exception as e:
+            print(f"\n❌ Run {i} failed: {e}")
+            user_input = input("Continue with next run? (y/n): ")
+            if user_input.lower() != 'y':
+                print("Stopping execution.")
+                sys.exit(1)
+        else:
+            print(f"\n✓ Run {i} completed successfully ({saved_filename})")
+
+
+def run_parallel(args, base_pattern: str, config: dict, templates: dict, fairgame_url: str) -> None:
+    """
+    Execute the runs concurrently in a process pool and save results as they finish.
+    
+    Failed runs are reported and the remaining runs keep going; the script exits
+    with a non-zero code at the end if any run failed. Each worker gets an equal
+    share of the model's per-minute request and token limits.
+    """
+    failed_runs = 0
+    workers = min(args.parallelism, args.num_runs)
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=set_process_count, initargs=(workers,)
+    ) as executor:
+        futures = {
+            executor.submit(_one_run, args.call_type, config, templates, fairgame_url): i
+            for i in range(1, args.num_runs + 1)
+        }
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                results = future.result()
+                saved_filename = save_results_with_pattern(results, base_pattern)
+            except Exception as e:
+                print(f"\n❌ Run {i} failed: {e}")
+                failed_runs += 1
+            else:
+                print(f"\n✓ Run {i} completed successfully ({saved_filename})")
+    
+    if failed_runs:
+        print(f"\n❌ {failed_runs}/{args.num_runs} runs failed.")
+        sys.exit(1)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Run Public Goods Game multiple times with specified parameters",
@@ -50,6 +127,7 @@ Examples:
   python run_public_goods_with_args.py --num_runs 10 --language en --multiplication_factor 1.1 --model claude
   python run_public_goods_with_args.py --num_runs 4 --language en --multiplication_factor 2.0 --model claude
   python run_public_goods_with_args.py --num_runs 9 --language vn --multiplication_factor 2.0 --model mistralarge
+  python run_public_goods_with_args.py --num_runs 10 --language en --multiplication_factor 2.9 --model chatgpt --parallelism 4
         """
     )
     
@@ -91,7 +169,18 @@ Examples:
         help="Call type: local or api (default: local)"
     )
     
+    parser.add_argument(
+        "--parallelism",
+        type=int,
+        default=None,
+        help="Number of runs executed concurrently; the model's rate limits are split "
+             "between them (default: min(num_runs, CPU count))"
+    )
+    
     args = parser.parse_args()
+    if args.parallelism is None:
+        args.parallelism = min(args.num_runs, os.cpu_count() or 1)
+    args.parallelism = max(1, args.parallelism)
     
     # Get config name
     config_name = get_config_name(args.language, args.multiplication_factor, args.model)
@@ -113,35 +202,19 @@ Examples:
     print(f"Multiplication Factor: {args.multiplication_factor}")
     print(f"Model: {args.model} ({MODEL_MAP[args.model]})")
     print(f"Number of runs: {args.num_runs}")
+    print(f"Parallelism: {args.parallelism}")
     print(f"Config: {config_name}")
     print(f"{'='*60}\n")
     
-    for i in range(1, args.num_runs + 1):
-        print(f"\n{'='*60}")
-        print(f"RUN {i}/{args.num_runs}")
-        print(f"{'='*60}\n")
-        
-        # Run the game with specified config
-        result = subprocess.run(
-            [
-                'python', 
-                'public_goods_game_run.py', 
-                args.call_type, 
-                args.language,
-                '--config', 
-                config_name
-            ],
-            capture_output=False
-        )
-        
-        if result.returncode != 0:
-            print(f"\n❌ Run {i} failed with exit code {result.returncode}")
-            user_input = input("Continue with next run? (y/n): ")
-            if user_input.lower() != 'y':
-                print("Stopping execution.")
-                sys.exit(1)
-        else:
-            print(f"\n✓ Run {i} completed successfully")
+    # Load everything once and reuse it for every run
+    fairgame_url = load_env_variables()
+    config, templates = load_game_inputs(args.language, config_name)
+    base_pattern = compute_base_pattern(config, config_name, args.language)
+    
+    if args.parallelism > 1:
+        run_parallel(args, base_pattern, config, templates, fairgame_url)
+    else:
+        run_sequential(args, base_pattern, config, templates, fairgame_url)
     
     print(f"\n{'='*60}")
     print(f"ALL {args.num_runs} RUNS COMPLETED!")
@@ -1,5 +1,5 @@
 from typing import Any, Dict, List
-from src.llm_connectors.llm_factory_connector import execute_prompt
+from src.llm_connectors.llm_factory_connector import execute_prompt, execute_prompt_async
 
 
 class Agent:
@@ -10,6 +10,8 @@ class Agent:
     by sending a prompt to the LLM service.
     """
 
+    __slots__ = ("name", "strategies", "scores", "llm_service", "personality", "opponent_personality_prob")
+
     def __init__(self, name: str, llm_service: str, personality: str, opponent_personality_prob: int) -> None:
         """
         Initialize the Agent instance.
@@ -41,6 +43,19 @@ class Agent:
         choice = execute_prompt(self.llm_service, prompt)
         return choice
 
+    async def execute_round_async(self, prompt: str, stop_pattern=None) -> str:
+        """
+        Asynchronous variant of execute_round, so several agents can wait on the LLM at once.
+
+        Args:
+            prompt (str): The prompt to send to the language model.
+            stop_pattern (re.Pattern, optional): Stop reading the response at the first match.
+
+        Returns:
+            str: The choice or response returned by the language model.
+        """
+        return await execute_prompt_async(self.llm_service, prompt, stop_pattern)
+
     def add_strategy(self, strategy: str) -> None:
         """
         Record a new strategy choice.
@@ -68,6 +83,15 @@ class Agent:
         """
         self.scores.append(score)
 
+    def extend_scores(self, scores: List[int]) -> None:
+        """
+        Record the scores of several consecutive rounds at once.
+
+        Args:
+            scores (List[int]): The scores to be added, in round order.
+        """
+        self.scores.extend(scores)
+
     def last_score(self) -> int:
         """
         Retrieve the most recent score.
@@ -1,4 +1,6 @@
 
+import functools
+
 from src.payoff_matrix import PayoffMatrix
 from src.game_history import GameHistory
 from src.game_round import GameRound
@@ -29,7 +31,7 @@ class FairGame:
         self.name = name
         self.language = language
         self.agents = agents
-        self.n_rounds = int(n_rounds)
+        self.n_rounds = self._str2int(n_rounds)
         self.n_rounds_known = self._str2bool(n_rounds_known)
         self.prompt_template = prompt_template
         self.stop_conditions = stop_conditions
@@ -39,10 +41,14 @@ class FairGame:
         self.choices_made = []
         self.payoff_matrix = PayoffMatrix(payoff_matrix_data, language)
 
-    def _str2bool(self, value):
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _str2bool(value):
         """
         Convert a string or bool to a boolean value.
 
+        Results are cached, since configs repeat the same few values across games.
+
         Args:
             value (str or bool): The value to interpret as bool.
 
@@ -51,6 +57,22 @@ class FairGame:
         """
         return value if isinstance(value, bool) else value.strip().lower() == 'true'
 
+    @staticmethod
+    @functools.lru_cache(maxsize=None, typed=True)
+    def _str2int(value):
+        """
+        Convert a string or number to an int, such as the configured number of rounds.
+
+        Results are cached like _str2bool's, keyed by type so that "1", 1 and True stay distinct.
+
+        Args:
+            value (str or int): The value to interpret as int.
+
+        Returns:
+            int: The interpreted integer value.
+        """
+        return int(value)
+
     @property
     def description(self):
         """
@@ -111,6 +111,22 @@ class GameRound:
             ValueError: If no matching strategy is found in the agent's response.
         """
         response = agent.execute_round(prompt)
+        found_strategy = self._record_strategy(agent, response)
+        if found_strategy:
+            return found_strategy
+        raise ValueError("No matching strategy found")
+
+    def _record_strategy(self, agent, response):
+        """
+        Find the strategy named in an agent's response and record it on the agent.
+
+        Args:
+            agent: The agent object that produced the response.
+            response (str): The raw LLM response.
+
+        Returns:
+            str or None: The strategy key found, or None if the response names no strategy.
+        """
         print("RESPONSE ", response)
         found_strategy = next(
             (key for key, val in self.game.payoff_matrix.strategies.items()
@@ -119,8 +135,7 @@ class GameRound:
         )
         if found_strategy:
             agent.add_strategy(self.game.payoff_matrix.strategies[found_strategy])
-            return found_strategy
-        raise ValueError("No matching strategy found")
+        return found_strategy
 
     def _update_round_history(self):
         """
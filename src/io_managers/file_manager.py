@@ -2,6 +2,10 @@ import json
 from pathlib import Path
 from striprtf.striprtf import rtf_to_text
 
+# Write buffer for result CSVs, so large frames reach the disk in few large writes
+CSV_WRITE_BUFFER_SIZE = 1 << 20
+
+
 class FileManager:
     """
     Handles reading and loading of files (JSON or text/RTF), 
@@ -67,12 +71,16 @@ class FileManager:
             return FileManager.load_text_file(filepath)
 
     @staticmethod
-    def save_results_csv(df, filepath: Path) -> None:
+    def save_results_csv(df, filepath: Path, chunksize: int = 10000) -> None:
         """
         Saves a DataFrame to a CSV file at the specified path.
 
+        Rows are serialized in chunks through a large write buffer.
+
         Args:
             df (pandas.DataFrame): DataFrame containing the results to save.
             filepath (Path): Path to the output CSV file.
+            chunksize (int): Number of rows serialized per chunk.
         """
-        df.to_csv(filepath, index=False)
+        with open(filepath, "w", encoding="utf-8", newline="", buffering=CSV_WRITE_BUFFER_SIZE) as file:
+            df.to_csv(file, index=False, chunksize=chunksize)
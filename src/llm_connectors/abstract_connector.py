@@ -1,14 +1,97 @@
 import abc
+import asyncio
+import collections
+import contextlib
+import hashlib
+import logging
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import List, Optional
+
+from src.llm_connectors.backpressure import get_controller, get_window
+from src.llm_connectors.circuit_breaker import get_breaker
+from src.llm_connectors.event_loop import run_coroutine
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Convert a Retry-After header, given in seconds or as an HTTP date, to seconds from now.
+
+    Returns:
+        float | None: Seconds to wait (0 if already past), or None if the value is missing or malformed.
+    """
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
 
 class AbstractConnector(abc.ABC):
     """
     Abstract base class for chat models.
+
+    Subclasses implement a single API call (_complete) and say which errors are
+    worth retrying (_classify_error). The retry loop is shared: every attempt holds
+    a slot of the provider's ConcurrencyController and reports its outcome to it.
+    Known provider models also pass a per-minute request/token window before each
+    call, and a per-provider circuit breaker fails calls fast while the provider is down.
+    Responses of deterministic (temperature 0) calls are cached per prompt. No shipped
+    connector samples at temperature 0 by default, so a default run never uses the cache;
+    build a connector with temperature=0, or with cache_deterministic_only=False, to enable it.
+    The synchronous send_prompt and send_many run on the shared connector event loop.
     """
 
+    RATE_LIMITED = "rate_limited"
+    TRANSIENT = "transient"
+
+    # Key of the ConcurrencyController shared by all connectors of the provider
+    provider = None
+
+    # Pause the provider when a rate limit has less than this share, or this many units, left
+    LOW_CAPACITY_RATIO = 0.10
+    LOW_CAPACITY_REMAINING = 2
+
+    # Sampling temperature sent with each call; None means the provider's default
+    temperature = None
+
+    # Maximum number of cached responses per connector
+    CACHE_SIZE = 4096
+
+    def __init__(self, provider_model: str, timeout: float = 20.0, retry_delay: float = 1.0, max_backoff: float = 60.0,
+                 total_budget: float = 120.0, cache_deterministic_only: bool = True):
+        self.provider_model = provider_model
+        # Wall-clock seconds a prompt may spend across all of its attempts and waits
+        self.total_budget = total_budget
+        # Sampled responses are only cached on request, since agents should not share one random draw;
+        # with the default temperature nothing is cached unless this is False
+        self.cache_deterministic_only = cache_deterministic_only
+        self._cache = collections.OrderedDict()
+        self._cache_locks = {}
+        # Per-request timeout in seconds; a timed-out call is retried like any transient error
+        self.timeout = timeout
+        self.retry_delay = retry_delay
+        self.max_backoff = max_backoff
+        self.controller = get_controller(self.provider)
+        self.breaker = get_breaker(self.provider)
+        self.window = get_window(provider_model)
+
     @abc.abstractmethod
-    def send_prompt(self, prompt: str) -> str:
+    async def _complete(self, prompt: str) -> str:
         """
-        Send a prompt to the chat API and return the response text.
+        Make one API call for the prompt and return the response text.
 
         Parameters:
             prompt (str): The user prompt.
@@ -17,3 +100,264 @@ class AbstractConnector(abc.ABC):
             str: The API's response.
         """
         pass
+
+    @abc.abstractmethod
+    def _stream(self, prompt: str):
+        """
+        Make one streaming API call for the prompt.
+
+        Parameters:
+            prompt (str): The user prompt.
+
+        Returns:
+            AsyncIterator[str]: The response text, chunk by chunk. Closing the iterator
+                                closes the underlying HTTP stream.
+        """
+        pass
+
+    async def _complete_until(self, prompt: str, stop_pattern) -> str:
+        """
+        Stream the response and stop reading as soon as stop_pattern matches the text so far.
+        """
+        text = ""
+        async with contextlib.aclosing(self._stream(prompt)) as chunks:
+            async for chunk in chunks:
+                text += chunk
+                if stop_pattern.search(text):
+                    break
+        return text
+
+    @abc.abstractmethod
+    def _classify_error(self, error: Exception) -> Optional[str]:
+        """
+        Decide whether a failed call should be retried.
+
+        Only rate limits (429) and provider-side failures (5xx, timeouts, connection
+        errors) may be retried: those are the errors that open the circuit breaker and
+        halve the concurrency limit. Other 4xx client errors must return None.
+
+        Parameters:
+            error (Exception): The exception raised by _complete.
+
+        Returns:
+            str | None: RATE_LIMITED, TRANSIENT, or None if the error must not be retried.
+        """
+        pass
+
+    @staticmethod
+    def _header_float(headers, name: str) -> Optional[float]:
+        """
+        Return a numeric response header, or None if it is missing or malformed.
+        """
+        value = headers.get(name)
+        if value is None:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _error_headers(error: Exception):
+        """
+        Return the HTTP headers of the response behind an API error, or an empty dict.
+        """
+        response = getattr(error, "response", None)
+        if response is None:
+            response = getattr(error, "raw_response", None)
+        return response.headers if response is not None else {}
+
+    def _retry_after_seconds(self, error: Exception) -> Optional[float]:
+        """
+        Return how long the server asked us to wait before retrying, if it said so.
+
+        Returns:
+            float | None: Seconds from the 'retry-after' header, or None if the response carries no hint.
+        """
+        return _parse_retry_after(self._error_headers(error).get("retry-after"))
+
+    def _rate_limit_wait(self, error: Exception, attempt: int) -> float:
+        """
+        Seconds to wait after a rate-limit error: the server's hint if present,
+        otherwise exponential backoff, capped at max_backoff in both cases.
+        """
+        wait_time = self._retry_after_seconds(error)
+        if wait_time is None:
+            wait_time = self.retry_delay * (2 ** attempt)
+        return min(wait_time, self.max_backoff)
+
+    def _pause_if_low_capacity(self, kind: str, remaining: Optional[float], limit: Optional[float],
+                               reset_seconds: Optional[float]) -> None:
+        """
+        Pause new requests to the provider until the limit resets if it is nearly exhausted,
+        so the next calls wait instead of hitting a 429.
+
+        Parameters:
+            kind (str): What the limit counts ("requests" or "tokens"), for the message.
+            remaining (float | None): Units left in the current window, from the response headers.
+            limit (float | None): Size of the window, from the response headers.
+            reset_seconds (float | None): Seconds until the window resets.
+        """
+        if remaining is None:
+            return
+        if remaining > self.LOW_CAPACITY_REMAINING and not (limit and remaining / limit < self.LOW_CAPACITY_RATIO):
+            return
+        wait_time = min(reset_seconds if reset_seconds is not None else self.retry_delay, self.max_backoff)
+        logger.info("Only %g %s left in the rate limit; pausing new requests for %.2fs.", remaining, kind, wait_time)
+        self.controller.pause(wait_time)
+
+    def _cache_key(self, prompt: str) -> str:
+        return hashlib.blake2b(
+            f"{self.provider_model}|{self.temperature}|{prompt}".encode(), digest_size=16
+        ).hexdigest()
+
+    async def send_prompt_async(self, prompt: str) -> str:
+        """
+        Send a prompt to the chat API, answering repeated prompts from the cache when allowed.
+
+        The cache is used only when temperature is 0 or cache_deterministic_only is False;
+        with the default sampling temperature every call goes to the API. When the cache
+        is used, identical prompts sent concurrently wait for the first one instead of
+        calling the API again.
+
+        Parameters:
+            prompt (str): The user prompt.
+
+        Returns:
+            str: The API's response.
+
+        Raises:
+            CircuitOpen: If the provider's circuit breaker is open.
+            TimeoutError: If the prompt is still failing once total_budget seconds have passed.
+        """
+        if self.cache_deterministic_only and self.temperature != 0:
+            return await self._send_with_retries(prompt)
+
+        key = self._cache_key(prompt)
+        lock = self._cache_locks.setdefault(key, asyncio.Lock())
+        try:
+            async with lock:
+                response = self._cache.get(key)
+                if response is not None:
+                    self._cache.move_to_end(key)
+                else:
+                    response = await self._send_with_retries(prompt)
+                    self._cache[key] = response
+                    if len(self._cache) > self.CACHE_SIZE:
+                        self._cache.popitem(last=False)
+        finally:
+            # Drop the lock even when the request failed, so failed prompts do not accumulate
+            if self._cache_locks.get(key) is lock:
+                del self._cache_locks[key]
+        return response
+
+    async def _send_with_retries(self, prompt: str, request=None):
+        """
+        Send a prompt to the chat API, retrying on rate-limit and transient errors.
+
+        Waiting between retries uses asyncio.sleep and happens outside the
+        concurrency slot, so other prompts keep making progress meanwhile.
+
+        Parameters:
+            prompt (str): The user prompt.
+            request (Callable, optional): Makes one API call for the prompt and returns its
+                                          awaitable result. Defaults to _complete(prompt).
+
+        Returns:
+            The result of the successful call; by default, the API's response text.
+
+        Raises:
+            CircuitOpen: If the provider's circuit breaker is open.
+            TimeoutError: If the prompt is still failing once total_budget seconds have passed.
+        """
+        if request is None:
+            request = lambda: self._complete(prompt)
+        deadline = time.monotonic() + self.total_budget
+        attempt = 0
+        while True:
+            if self.window is not None:
+                # About four characters per token
+                await self.window.wait_if_throttled(len(prompt) // 4)
+            probe = self.breaker.before_call()
+            try:
+                async with self.controller.slot():
+                    start = time.perf_counter()
+                    try:
+                        response = await request()
+                    except Exception as e:
+                        error, kind = e, self._classify_error(e)
+                        if kind is None:
+                            # For unexpected errors, don't retry; a client error says nothing about the provider
+                            logger.error("Unexpected error: %s", e)
+                            raise
+                        # Only rate limits and provider-side failures reach here, so only they
+                        # count against the breaker and decrease the concurrency limit
+                        self.breaker.record_failure()
+                        self.controller.record_failure()
+                    else:
+                        self.breaker.record_success()
+                        self.controller.record_success(time.perf_counter() - start)
+                        return response
+            finally:
+                # A half-open probe that ended without a recorded outcome must not wedge the breaker
+                self.breaker.release(probe)
+
+            attempt += 1
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(
+                    f"{self.provider_model} did not answer within {self.total_budget}s ({attempt} attempts)."
+                ) from error
+            wait_time = self._rate_limit_wait(error, attempt) if kind == self.RATE_LIMITED else self.retry_delay
+            # Up to 10% jitter, so prompts throttled together do not all retry at the same instant
+            wait_time = min(wait_time + random.uniform(0, wait_time * 0.1), remaining)
+            if kind == self.RATE_LIMITED:
+                logger.warning("Rate limit hit; waiting %.2fs before retry (attempt %d).", wait_time, attempt)
+            else:
+                logger.warning("API error: %s; retrying in %.2fs (attempt %d).", error, wait_time, attempt)
+            await asyncio.sleep(wait_time)
+
+    def send_prompt(self, prompt: str) -> str:
+        """
+        Send a prompt to the chat API and wait for the response text.
+
+        Parameters:
+            prompt (str): The user prompt.
+
+        Returns:
+            str: The API's response.
+        """
+        return run_coroutine(self.send_prompt_async(prompt))
+
+    async def send_prompt_until_async(self, prompt: str, stop_pattern) -> str:
+        """
+        Send a prompt and stream the response, stopping once stop_pattern matches.
+
+        Meant for prompts whose answer is a short token, such as a strategy name: the
+        connection is closed as soon as the answer appears instead of waiting for the
+        full generation. Retries, backpressure and the circuit breaker apply as usual;
+        the response cache does not.
+
+        Parameters:
+            prompt (str): The user prompt.
+            stop_pattern (re.Pattern): Pattern whose first match ends the stream.
+
+        Returns:
+            str: The response text received up to and including the match.
+        """
+        return await self._send_with_retries(prompt, lambda: self._complete_until(prompt, stop_pattern))
+
+    async def _send_many_async(self, prompts: List[str]) -> List[str]:
+        return await asyncio.gather(*(self.send_prompt_async(prompt) for prompt in prompts))
+
+    def send_many(self, prompts: List[str]) -> List[str]:
+        """
+        Send several independent prompts concurrently and return the responses in order.
+
+        Parameters:
+            prompts (List[str]): The user prompts.
+
+        Returns:
+            List[str]: The API's responses, in the same order as the prompts.
+        """
+        return run_coroutine(self._send_many_async(prompts))
@@ -1,48 +1,112 @@
-from anthropic import Anthropic, RateLimitError, APIError, APITimeoutError
-import os
-import time
+from anthropic import (
+    AsyncAnthropic, RateLimitError, APIConnectionError, APIStatusError, APITimeoutError, InternalServerError
+)
+from datetime import datetime, timezone
+from typing import Optional
 
 from src.llm_connectors.abstract_connector import AbstractConnector
+from src.llm_connectors.http_clients import get_api_key, get_sdk_client
+
+
+def _seconds_until(timestamp: Optional[str]) -> Optional[float]:
+    """
+    Return the seconds from now until an RFC 3339 timestamp, as used by Anthropic's reset headers.
+
+    Returns:
+        float | None: Seconds to wait (0 if already past), or None if the timestamp is missing or malformed.
+    """
+    if timestamp is None:
+        return None
+    try:
+        reset_time = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if reset_time.tzinfo is None:
+        reset_time = reset_time.replace(tzinfo=timezone.utc)
+    return max(0.0, (reset_time - datetime.now(timezone.utc)).total_seconds())
+
+
+def _anthropic_client() -> AsyncAnthropic:
+    """
+    Return the process-wide AsyncAnthropic client for API_KEY_ANTHROPIC.
+
+    The SDK's own retries are disabled; AbstractConnector handles them.
+    """
+    api_key = get_api_key("API_KEY_ANTHROPIC")
+    return get_sdk_client(
+        "anthropic", api_key,
+        lambda http_client: AsyncAnthropic(api_key=api_key, max_retries=0, http_client=http_client)
+    )
+
 
 class AnthropicConnector(AbstractConnector):
     """
     Chat model implementation for the Claude API (Anthropic) with automatic retry on errors.
     """
 
-    def __init__(self, provider_model: str, max_tokens: int = 1024, retry_delay: float = 1.0, max_backoff: float = 60.0):
-        self.api_key = os.getenv("API_KEY_ANTHROPIC")
-        if not self.api_key:
-            raise EnvironmentError("API_KEY_ANTHROPIC not found in environment variables.")
-        self.provider_model = provider_model
+    provider = "anthropic"
+
+    def __init__(self, provider_model: str, max_tokens: int = 1024, timeout: float = 20.0,
+                 retry_delay: float = 1.0, max_backoff: float = 60.0,
+                 total_budget: float = 120.0, cache_deterministic_only: bool = True):
+        super().__init__(provider_model, timeout=timeout, retry_delay=retry_delay, max_backoff=max_backoff,
+                         total_budget=total_budget, cache_deterministic_only=cache_deterministic_only)
         self.max_tokens = max_tokens
-        self.client = Anthropic(api_key=self.api_key)
-        self.retry_delay = retry_delay
-        self.max_backoff = max_backoff
-
-    def send_prompt(self, prompt: str) -> str:
-        attempt = 0
-        while True:
-            try:
-                response = self.client.messages.create(
-                    max_tokens=self.max_tokens,
-                    messages=[{"role": "user", "content": prompt}],
-                    model=self.provider_model,
-                )
-                return response.content[0].text
-            
-            except RateLimitError as e:
-                attempt += 1
-                wait_time = min(self.retry_delay * (2 ** attempt), self.max_backoff)  # Exponential backoff with max
-                print(f"Rate limit hit. Waiting {wait_time}s before retry (attempt {attempt})...")
-                time.sleep(wait_time)
-            
-            except (APIError, APITimeoutError) as e:
-                attempt += 1
-                wait_time = self.retry_delay
-                print(f"API error: {e}. Retrying in {wait_time}s... (attempt {attempt})")
-                time.sleep(wait_time)
-            
-            except Exception as e:
-                # For unexpected errors, don't retry
-                print(f"Unexpected error: {e}")
-                raise
\ No newline at end of file
+        self.api_key = get_api_key("API_KEY_ANTHROPIC")
+        self.client = _anthropic_client()
+
+    def _retry_after_seconds(self, error: Exception) -> Optional[float]:
+        """
+        The standard 'retry-after' hint, falling back to Anthropic's
+        'anthropic-ratelimit-requests-reset' timestamp.
+        """
+        wait_time = super()._retry_after_seconds(error)
+        if wait_time is None:
+            wait_time = _seconds_until(self._error_headers(error).get("anthropic-ratelimit-requests-reset"))
+        return wait_time
+
+    def _check_rate_limit_headers(self, headers) -> None:
+        """
+        Pause the provider early when the request or token limit is nearly used up.
+        """
+        for kind in ("requests", "tokens"):
+            self._pause_if_low_capacity(
+                kind,
+                self._header_float(headers, f"anthropic-ratelimit-{kind}-remaining"),
+                self._header_float(headers, f"anthropic-ratelimit-{kind}-limit"),
+                _seconds_until(headers.get(f"anthropic-ratelimit-{kind}-reset")),
+            )
+
+    async def _complete(self, prompt: str) -> str:
+        # The raw response exposes the rate-limit headers sent with every reply
+        raw_response = await self.client.messages.with_raw_response.create(
+            max_tokens=self.max_tokens,
+            messages=[{"role": "user", "content": prompt}],
+            model=self.provider_model,
+            timeout=self.timeout,
+        )
+        self._check_rate_limit_headers(raw_response.headers)
+        return raw_response.parse().content[0].text
+
+    async def _stream(self, prompt: str):
+        async with self.client.messages.stream(
+            max_tokens=self.max_tokens,
+            messages=[{"role": "user", "content": prompt}],
+            model=self.provider_model,
+            timeout=self.timeout,
+        ) as stream:
+            # The headers arrive before the first chunk; a stopped stream never reaches a final response
+            self._check_rate_limit_headers(stream.response.headers)
+            async for text in stream.text_stream:
+                yield text
+
+    def _classify_error(self, error: Exception) -> Optional[str]:
+        if isinstance(error, RateLimitError):
+            return self.RATE_LIMITED
+        # Connection failures, timeouts and 5xx replies are retried; other 4xx errors
+        # (bad key, unknown model, malformed request) would fail again, so they are raised
+        if isinstance(error, (APIConnectionError, APITimeoutError, InternalServerError)):
+            return self.TRANSIENT
+        if isinstance(error, APIStatusError) and error.status_code >= 500:
+            return self.TRANSIENT
+        return None
@@ -0,0 +1,241 @@
+import asyncio
+import collections
+import contextlib
+import os
+import threading
+import time
+from typing import Optional
+
+
+class ConcurrencyController:
+    """
+    Adaptive limit on the number of requests in flight to one provider.
+
+    The limit follows AIMD, as in TCP congestion control: every success while the
+    average latency over the last `window_size` calls stays within `target_latency`
+    raises it by `increase_step`; a slow window or a rate-limit/server error
+    multiplies it by `decrease_factor`. The limit is clamped to [min_limit, max_limit].
+
+    All coroutines using a controller must run on the same event loop (the shared
+    connector loop).
+    """
+
+    def __init__(self, initial_limit: float = 4.0, min_limit: float = 1.0, max_limit: float = 16.0,
+                 target_latency: float = 10.0, window_size: int = 20,
+                 increase_step: float = 0.5, decrease_factor: float = 0.5):
+        self.limit = initial_limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency = target_latency
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.latencies = collections.deque(maxlen=window_size)
+        self.in_flight = 0
+        self._condition = None
+        self._open = None
+        self._resume_at = 0.0
+
+    @property
+    def average_latency(self) -> float:
+        """
+        float: Mean latency in seconds over the sliding window (0.0 before any sample).
+        """
+        return sum(self.latencies) / len(self.latencies) if self.latencies else 0.0
+
+    def _set_limit(self, limit: float) -> None:
+        self.limit = min(self.max_limit, max(self.min_limit, limit))
+
+    def record_success(self, latency: float) -> None:
+        """
+        Feed the latency of a successful call into the window and adjust the limit.
+
+        Parameters:
+            latency (float): Duration of the call in seconds.
+        """
+        self.latencies.append(latency)
+        if self.average_latency <= self.target_latency:
+            self._set_limit(self.limit + self.increase_step)
+        else:
+            self._set_limit(self.limit * self.decrease_factor)
+
+    def record_failure(self) -> None:
+        """
+        Back off after a rate-limit or server error.
+        """
+        self._set_limit(self.limit * self.decrease_factor)
+
+    def _gate(self) -> asyncio.Event:
+        if self._open is None:
+            self._open = asyncio.Event()
+            self._open.set()
+        return self._open
+
+    def pause(self, seconds: float) -> None:
+        """
+        Hold back new requests for the given time, e.g. when the provider reports
+        that its rate limit is nearly exhausted. Requests already in flight are not
+        affected; overlapping pauses extend to the latest end.
+
+        Parameters:
+            seconds (float): How long to pause.
+        """
+        loop = asyncio.get_running_loop()
+        resume_at = loop.time() + seconds
+        if resume_at <= self._resume_at:
+            return
+        self._resume_at = resume_at
+        self._gate().clear()
+        loop.call_at(resume_at, self._resume, resume_at)
+
+    def _resume(self, resume_at: float) -> None:
+        # A later pause replaced this one; its own callback reopens the gate
+        if resume_at == self._resume_at:
+            self._gate().set()
+
+    @contextlib.asynccontextmanager
+    async def slot(self):
+        """
+        Wait until no pause is active and fewer than `limit` requests are in flight,
+        then hold a slot for the block.
+        """
+        await self._gate().wait()
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self.in_flight -= 1
+                self._condition.notify_all()
+
+
+class SlidingWindow:
+    """
+    Client-side requests-per-minute and tokens-per-minute limit.
+
+    Remembers the time and estimated token count of every request sent in the
+    last `window` seconds, so the first burst of a run stays within the provider's
+    published limits instead of discovering them through 429s.
+    """
+
+    def __init__(self, rpm: int, tpm: int, window: float = 60.0):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.window = window
+        self.entries = collections.deque()
+        self.token_total = 0
+
+    def _expire(self, now: float) -> None:
+        while self.entries and self.entries[0][0] <= now - self.window:
+            _, tokens = self.entries.popleft()
+            self.token_total -= tokens
+
+    async def wait_if_throttled(self, est_tokens: int) -> None:
+        """
+        Wait until a request of `est_tokens` tokens fits in both limits, then record it.
+
+        A request larger than the whole token limit is let through once the window is empty.
+
+        Parameters:
+            est_tokens (int): Estimated number of tokens in the request.
+        """
+        while True:
+            now = time.monotonic()
+            self._expire(now)
+            if not self.entries or (len(self.entries) < self.rpm and self.token_total + est_tokens <= self.tpm):
+                self.entries.append((now, est_tokens))
+                self.token_total += est_tokens
+                return
+            await asyncio.sleep(self.entries[0][0] + self.window - now)
+
+
+# Published per-minute limits (requests, input tokens), keyed by provider model prefix
+PROVIDER_LIMITS = {
+    "claude-3-5-haiku": (50, 50000),
+    "gpt-4o": (500, 30000),
+    "mistral-large": (60, 500000),
+}
+
+_CONTROLLERS = {}
+_CONTROLLERS_LOCK = threading.Lock()
+
+
+def get_controller(provider: str) -> ConcurrencyController:
+    """
+    Return the controller shared by every connector of a provider, creating it on first use.
+
+    Parameters:
+        provider (str): Provider name, e.g. "anthropic".
+
+    Returns:
+        ConcurrencyController: The provider's controller.
+    """
+    with _CONTROLLERS_LOCK:
+        controller = _CONTROLLERS.get(provider)
+        if controller is None:
+            controller = ConcurrencyController()
+            _CONTROLLERS[provider] = controller
+        return controller
+
+
+_WINDOWS = {}
+# Number of processes sharing the limits of PROVIDER_LIMITS; see set_process_count
+_PROCESS_COUNT = 1
+
+
+def _reset_after_fork() -> None:
+    # A forked child inherits the parent's limits and in-flight counts, and possibly a held lock
+    global _CONTROLLERS_LOCK
+    _CONTROLLERS.clear()
+    _WINDOWS.clear()
+    _CONTROLLERS_LOCK = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def set_process_count(count: int) -> None:
+    """
+    Split the per-model limits of PROVIDER_LIMITS evenly between `count` processes.
+
+    Windows are kept per process, so `count` workers that each used the full limits
+    would send `count` times the provider's RPM/TPM. Call this in every worker, e.g.
+    as the process pool initializer, before its first request.
+
+    Parameters:
+        count (int): Number of processes sending requests at the same time.
+    """
+    global _PROCESS_COUNT
+    with _CONTROLLERS_LOCK:
+        _PROCESS_COUNT = max(1, count)
+        # Windows built for the previous count keep their limits, so drop them
+        _WINDOWS.clear()
+
+
+def get_window(provider_model: str) -> Optional[SlidingWindow]:
+    """
+    Return the sliding window shared by every connector of a provider model.
+
+    The window gets this process's share of the model's limits (see set_process_count).
+
+    Parameters:
+        provider_model (str): Provider model identifier, e.g. "gpt-4o".
+
+    Returns:
+        SlidingWindow | None: The model's window, or None if PROVIDER_LIMITS has no profile for it.
+    """
+    with _CONTROLLERS_LOCK:
+        if provider_model not in _WINDOWS:
+            prefixes = [prefix for prefix in PROVIDER_LIMITS if provider_model.startswith(prefix)]
+            if prefixes:
+                rpm, tpm = PROVIDER_LIMITS[max(prefixes, key=len)]
+                _WINDOWS[provider_model] = SlidingWindow(
+                    max(1, rpm // _PROCESS_COUNT), max(1, tpm // _PROCESS_COUNT)
+                )
+            else:
+                _WINDOWS[provider_model] = None
+        return _WINDOWS[provider_model]
@@ -0,0 +1,121 @@
+import os
+import threading
+import time
+
+
+class CircuitOpen(Exception):
+    """
+    Raised instead of calling a provider whose circuit breaker is open.
+    """
+
+
+class CircuitBreaker:
+    """
+    Fast-fail guard for a provider that is down.
+
+    CLOSED: calls go through. After `failure_threshold` consecutive failed calls (rate
+    limits, server and connection errors; client errors do not count) the breaker opens. OPEN: calls raise CircuitOpen until `cooldown` seconds have passed.
+    HALF_OPEN: a single probe call is let through; its success closes the breaker,
+    its failure opens it again for another cooldown.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, cooldown: float = 60.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = self.CLOSED
+        self.failure_count = 0
+        self.opened_at = 0.0
+        self.half_open_inflight = False
+        self._lock = threading.Lock()
+
+    def before_call(self) -> bool:
+        """
+        Check that a call may go through, moving an expired OPEN breaker to HALF_OPEN.
+
+        Returns:
+            bool: True if the call is the half-open probe; pass it to release() once the call ends.
+
+        Raises:
+            CircuitOpen: If the breaker is open, or a half-open probe is already in flight.
+        """
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.cooldown:
+                    raise CircuitOpen(f"Circuit for {self.name} is open.")
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN:
+                if self.half_open_inflight:
+                    raise CircuitOpen(f"Circuit for {self.name} is half-open and already probing.")
+                self.half_open_inflight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """
+        Close the breaker after a successful call.
+        """
+        with self._lock:
+            self.state = self.CLOSED
+            self.failure_count = 0
+            self.half_open_inflight = False
+
+    def release(self, probe: bool) -> None:
+        """
+        End a call. If it was the half-open probe and its outcome was not recorded, e.g.
+        because it raised a client error or was cancelled, let the next probe through.
+
+        Parameters:
+            probe (bool): The value before_call returned for the call.
+        """
+        if probe:
+            with self._lock:
+                self.half_open_inflight = False
+
+    def record_failure(self) -> None:
+        """
+        Count a failed call, opening the breaker on a failed probe or at the threshold.
+        """
+        with self._lock:
+            self.failure_count += 1
+            self.half_open_inflight = False
+            if self.state == self.HALF_OPEN or self.failure_count >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+_BREAKERS = {}
+_BREAKERS_LOCK = threading.Lock()
+
+
+def _reset_after_fork() -> None:
+    # A forked child inherits the parent's failure counts, and possibly a held lock
+    global _BREAKERS_LOCK
+    _BREAKERS.clear()
+    _BREAKERS_LOCK = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def get_breaker(provider: str) -> CircuitBreaker:
+    """
+    Return the circuit breaker shared by every connector of a provider, creating it on first use.
+
+    Parameters:
+        provider (str): Provider name, e.g. "anthropic".
+
+    Returns:
+        CircuitBreaker: The provider's breaker.
+    """
+    with _BREAKERS_LOCK:
+        breaker = _BREAKERS.get(provider)
+        if breaker is None:
+            breaker = CircuitBreaker(provider)
+            _BREAKERS[provider] = breaker
+        return breaker
@@ -0,0 +1,40 @@
+import asyncio
+import os
+import threading
+
+_loop = None
+_loop_pid = None
+_lock = threading.Lock()
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Return the background event loop shared by all connectors, starting it on first use.
+
+    A single long-lived loop lets the async provider clients keep their connection
+    pools between calls. The loop is recreated in a forked child process, where the
+    parent's loop thread does not exist.
+
+    Returns:
+        asyncio.AbstractEventLoop: The running shared loop.
+    """
+    global _loop, _loop_pid
+    with _lock:
+        if _loop is None or _loop_pid != os.getpid():
+            _loop = asyncio.new_event_loop()
+            _loop_pid = os.getpid()
+            threading.Thread(target=_loop.run_forever, name="llm-connectors-loop", daemon=True).start()
+        return _loop
+
+
+def run_coroutine(coro):
+    """
+    Run a coroutine on the shared loop from synchronous code and wait for its result.
+
+    Parameters:
+        coro: The coroutine to run.
+
+    Returns:
+        The coroutine's result; its exception is re-raised in the caller.
+    """
+    return asyncio.run_coroutine_threadsafe(coro, get_event_loop()).result()
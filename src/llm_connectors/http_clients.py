@@ -0,0 +1,87 @@
+import functools
+import os
+import threading
+from typing import Callable
+
+import httpx
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx when installed)
+except ImportError:
+    h2 = None
+
+# One connection pool for every provider client in the process
+POOL_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+
+_http_client = None
+_sdk_clients = {}
+_clients_pid = None
+_lock = threading.Lock()
+
+
+def _reset_after_fork() -> None:
+    # Pools are tied to the parent's event loop and sockets; a forked child starts fresh
+    global _http_client, _clients_pid
+    if _clients_pid != os.getpid():
+        _http_client = None
+        _sdk_clients.clear()
+        _clients_pid = os.getpid()
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Return the process-wide httpx client whose keep-alive pool all provider SDKs share.
+
+    HTTP/2 is used when the optional h2 package is installed, so concurrent agent
+    requests to a provider can be multiplexed over one connection.
+
+    Returns:
+        httpx.AsyncClient: The shared client.
+    """
+    global _http_client
+    with _lock:
+        _reset_after_fork()
+        if _http_client is None:
+            _http_client = httpx.AsyncClient(limits=POOL_LIMITS, http2=h2 is not None, timeout=20.0)
+        return _http_client
+
+
+@functools.lru_cache(maxsize=None)
+def get_api_key(env_var: str) -> str:
+    """
+    Read an API key from the environment once per process.
+
+    Parameters:
+        env_var (str): Name of the environment variable, e.g. "API_KEY_OPENAI".
+
+    Returns:
+        str: The API key.
+
+    Raises:
+        EnvironmentError: If the variable is not set (not cached, so a later call can succeed).
+    """
+    api_key = os.getenv(env_var)
+    if not api_key:
+        raise EnvironmentError(f"{env_var} not found in environment variables.")
+    return api_key
+
+
+def get_sdk_client(provider: str, api_key: str, factory: Callable):
+    """
+    Return the SDK client for (provider, api_key), creating it with factory on first use.
+
+    Parameters:
+        provider (str): Provider name, e.g. "openai".
+        api_key (str): The API key the client authenticates with.
+        factory (Callable): Called with the shared httpx client to build the SDK client.
+
+    Returns:
+        The memoized SDK client.
+    """
+    http_client = get_http_client()
+    with _lock:
+        client = _sdk_clients.get((provider, api_key))
+        if client is None:
+            client = factory(http_client)
+            _sdk_clients[(provider, api_key)] = client
+        return client
@@ -1,3 +1,4 @@
+import os
 
 from dotenv import load_dotenv
 from src.llm_connectors.anthropic_connector import AnthropicConnector
@@ -18,8 +19,13 @@ MODEL_PROVIDER_MAP = {
 class ChatModelFactory:
     """
     Factory for creating chat model instances based on the model name.
+
+    Instances are cached per model name, so repeated prompts reuse the same
+    connector and its underlying HTTP client.
     """
 
+    _instances = {}
+
     @staticmethod
     def get_model(model_name: str):
         """
@@ -34,11 +40,21 @@ class ChatModelFactory:
         Raises:
             ValueError: If the model_name is unsupported.
         """
+        chat_model = ChatModelFactory._instances.get(model_name)
+        if chat_model is not None:
+            return chat_model
         provider_info = MODEL_PROVIDER_MAP.get(model_name)
         if not provider_info:
             raise ValueError(f"Unsupported model specified: {model_name}")
         model_class, provider_model = provider_info
-        return model_class(provider_model)
+        chat_model = model_class(provider_model)
+        ChatModelFactory._instances[model_name] = chat_model
+        return chat_model
+
+
+# Connectors hold the parent's controllers and breakers; a forked child builds its own
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=ChatModelFactory._instances.clear)
 
 
 def execute_prompt(model_name: str, prompt: str) -> str:
@@ -56,6 +72,25 @@ def execute_prompt(model_name: str, prompt: str) -> str:
     return chat_model.send_prompt(prompt)
 
 
+async def execute_prompt_async(model_name: str, prompt: str, stop_pattern=None) -> str:
+    """
+    Execute a prompt using the specified model without blocking the event loop.
+
+    Parameters:
+        model_name (str): The abstract model name (e.g., "MistralLarge", "GPT4", "Claude").
+        prompt (str): The prompt text to send to the API.
+        stop_pattern (re.Pattern, optional): If given, the response is streamed and
+                                             cut off at the first match.
+
+    Returns:
+        str: The response text from the API.
+    """
+    chat_model = ChatModelFactory.get_model(model_name)
+    if stop_pattern is not None:
+        return await chat_model.send_prompt_until_async(prompt, stop_pattern)
+    return await chat_model.send_prompt_async(prompt)
+
+
 if __name__ == "__main__":
     # Example usage:
     model_identifier = "Claude35Sonnet"
@@ -1,55 +1,74 @@
-
 from mistralai import Mistral
-import os
-import time
+from mistralai.models import SDKError
+import httpx
+from typing import Optional
 from requests.exceptions import HTTPError, Timeout, ConnectionError
 
 from src.llm_connectors.abstract_connector import AbstractConnector
+from src.llm_connectors.http_clients import get_api_key, get_sdk_client
+
+
+def _mistral_client() -> Mistral:
+    """
+    Return the process-wide Mistral client for API_KEY_MISTRAL.
+    """
+    api_key = get_api_key("API_KEY_MISTRAL")
+    return get_sdk_client(
+        "mistral", api_key,
+        lambda http_client: Mistral(api_key=api_key, async_client=http_client)
+    )
+
 
 class MistralConnector(AbstractConnector):
     """
     Chat model implementation for the Mistral API with automatic retry on errors.
     """
 
-    def __init__(self, provider_model: str, retry_delay: float = 1.0, max_backoff: float = 60.0):
-        self.api_key = os.getenv("API_KEY_MISTRAL")
-        if not self.api_key:
-            raise EnvironmentError("API_KEY_MISTRAL not found in environment variables.")
-        self.provider_model = provider_model
-        self.client = Mistral(api_key=self.api_key)
-        self.retry_delay = retry_delay
-        self.max_backoff = max_backoff
-
-    def send_prompt(self, prompt: str) -> str:
-        attempt = 0
-        while True:
-            try:
-                response = self.client.chat.complete(
-                    model=self.provider_model,
-                    messages=[{"role": "user", "content": prompt}]
-                )
-                return response.choices[0].message.content
-            
-            except HTTPError as e:
-                attempt += 1
-                # Check if it's a rate limit error (429)
-                if hasattr(e, 'response') and e.response.status_code == 429:
-                    wait_time = min(self.retry_delay * (2 ** attempt), self.max_backoff)  # Exponential backoff with max
-                    print(f"Rate limit hit. Waiting {wait_time}s before retry (attempt {attempt})...")
-                    time.sleep(wait_time)
-                # Other HTTP errors
-                else:
-                    wait_time = self.retry_delay
-                    print(f"HTTP error: {e}. Retrying in {wait_time}s... (attempt {attempt})")
-                    time.sleep(wait_time)
-            
-            except (Timeout, ConnectionError) as e:
-                attempt += 1
-                wait_time = self.retry_delay
-                print(f"Connection error: {e}. Retrying in {wait_time}s... (attempt {attempt})")
-                time.sleep(wait_time)
-            
-            except Exception as e:
-                # For unexpected errors, don't retry
-                print(f"Unexpected error: {e}")
-                raise
+    provider = "mistral"
+
+    def __init__(self, provider_model: str, max_tokens: int = 1024, timeout: float = 20.0,
+                 retry_delay: float = 1.0, max_backoff: float = 60.0,
+                 total_budget: float = 120.0, cache_deterministic_only: bool = True):
+        super().__init__(provider_model, timeout=timeout, retry_delay=retry_delay, max_backoff=max_backoff,
+                         total_budget=total_budget, cache_deterministic_only=cache_deterministic_only)
+        self.max_tokens = max_tokens
+        self.api_key = get_api_key("API_KEY_MISTRAL")
+        self.client = _mistral_client()
+
+    async def _complete(self, prompt: str) -> str:
+        response = await self.client.chat.complete_async(
+            model=self.provider_model,
+            max_tokens=self.max_tokens,
+            messages=[{"role": "user", "content": prompt}],
+            timeout_ms=int(self.timeout * 1000),
+        )
+        return response.choices[0].message.content
+
+    async def _stream(self, prompt: str):
+        stream = await self.client.chat.stream_async(
+            model=self.provider_model,
+            max_tokens=self.max_tokens,
+            messages=[{"role": "user", "content": prompt}],
+            timeout_ms=int(self.timeout * 1000),
+        )
+        async with stream:
+            async for event in stream:
+                choices = event.data.choices
+                if choices and isinstance(choices[0].delta.content, str):
+                    yield choices[0].delta.content
+
+    def _classify_error(self, error: Exception) -> Optional[str]:
+        # The SDK reports HTTP failures as SDKError; requests' errors are kept for older SDKs
+        if isinstance(error, (SDKError, HTTPError)):
+            status_code = getattr(error, "status_code", None)
+            if status_code is None and getattr(error, "response", None) is not None:
+                status_code = error.response.status_code
+            if status_code == 429:
+                return self.RATE_LIMITED
+            # Server errors are retried; other 4xx client errors would fail again, so they are raised
+            if status_code is None or status_code >= 500:
+                return self.TRANSIENT
+            return None
+        if isinstance(error, (httpx.TransportError, Timeout, ConnectionError)):
+            return self.TRANSIENT
+        return None
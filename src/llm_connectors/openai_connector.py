@@ -1,50 +1,109 @@
-from openai import OpenAI, RateLimitError, APIError, APITimeoutError
-import os
-import time
+from openai import (
+    AsyncOpenAI, RateLimitError, APIConnectionError, APIStatusError, APITimeoutError, InternalServerError
+)
+import re
+from typing import Optional
 
 from src.llm_connectors.abstract_connector import AbstractConnector
+from src.llm_connectors.http_clients import get_api_key, get_sdk_client
+
+# Reset headers are durations such as "20ms", "1s" or "6m0s"
+_DURATION_PART_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def _duration_seconds(duration: Optional[str]) -> Optional[float]:
+    """
+    Convert an OpenAI reset duration like "6m0s" to seconds.
+
+    Returns:
+        float | None: The duration in seconds, or None if it is missing or malformed.
+    """
+    if not duration:
+        return None
+    parts = _DURATION_PART_RE.findall(duration)
+    if not parts or "".join(value + unit for value, unit in parts) != duration:
+        return None
+    return sum(float(value) * _DURATION_UNITS[unit] for value, unit in parts)
+
+
+def _openai_client() -> AsyncOpenAI:
+    """
+    Return the process-wide AsyncOpenAI client for API_KEY_OPENAI.
+
+    The SDK's own retries are disabled; AbstractConnector handles them.
+    """
+    api_key = get_api_key("API_KEY_OPENAI")
+    return get_sdk_client(
+        "openai", api_key,
+        lambda http_client: AsyncOpenAI(api_key=api_key, max_retries=0, http_client=http_client)
+    )
+
 
 class OpenAIConnector(AbstractConnector):
     """
     Chat model implementation for the OpenAI API with automatic retry on errors.
     """
 
-    def __init__(self, provider_model: str, temperature: float = 1.0, retry_delay: float = 1.0, max_backoff: float = 60.0):
-        self.api_key = os.getenv("API_KEY_OPENAI")
-        if not self.api_key:
-            raise EnvironmentError("API_KEY_OPENAI not found in environment variables.")
-        self.provider_model = provider_model
+    provider = "openai"
+
+    def __init__(self, provider_model: str, temperature: float = 1.0, max_tokens: int = 1024, timeout: float = 20.0,
+                 retry_delay: float = 1.0, max_backoff: float = 60.0,
+                 total_budget: float = 120.0, cache_deterministic_only: bool = True):
+        super().__init__(provider_model, timeout=timeout, retry_delay=retry_delay, max_backoff=max_backoff,
+                         total_budget=total_budget, cache_deterministic_only=cache_deterministic_only)
         self.temperature = temperature
-        self.client = OpenAI(api_key=self.api_key)
-        self.retry_delay = retry_delay
-        self.max_backoff = max_backoff
-
-    def send_prompt(self, prompt: str) -> str:
-        messages = [{"role": "user", "content": prompt}]
-        
-        attempt = 0
-        while True:
-            try:
-                completion = self.client.chat.completions.create(
-                    model=self.provider_model,
-                    temperature=self.temperature,
-                    messages=messages
-                )
-                return completion.choices[0].message.content
-            
-            except RateLimitError as e:
-                attempt += 1
-                wait_time = min(self.retry_delay * (2 ** attempt), self.max_backoff)  # Exponential backoff with max
-                print(f"Rate limit hit. Waiting {wait_time}s before retry (attempt {attempt})...")
-                time.sleep(wait_time)
-            
-            except (APIError, APITimeoutError) as e:
-                attempt += 1
-                wait_time = self.retry_delay
-                print(f"API error: {e}. Retrying in {wait_time}s... (attempt {attempt})")
-                time.sleep(wait_time)
-            
-            except Exception as e:
-                # For unexpected errors, don't retry
-                print(f"Unexpected error: {e}")
-                raise
+        self.max_tokens = max_tokens
+        self.api_key = get_api_key("API_KEY_OPENAI")
+        self.client = _openai_client()
+
+    def _check_rate_limit_headers(self, headers) -> None:
+        """
+        Pause the provider early when the request or token limit is nearly used up.
+        """
+        for kind in ("requests", "tokens"):
+            self._pause_if_low_capacity(
+                kind,
+                self._header_float(headers, f"x-ratelimit-remaining-{kind}"),
+                self._header_float(headers, f"x-ratelimit-limit-{kind}"),
+                _duration_seconds(headers.get(f"x-ratelimit-reset-{kind}")),
+            )
+
+    async def _complete(self, prompt: str) -> str:
+        # The raw response exposes the rate-limit headers sent with every reply
+        raw_response = await self.client.chat.completions.with_raw_response.create(
+            model=self.provider_model,
+            temperature=self.temperature,
+            max_tokens=self.max_tokens,
+            messages=[{"role": "user", "content": prompt}],
+            timeout=self.timeout,
+        )
+        self._check_rate_limit_headers(raw_response.headers)
+        return raw_response.parse().choices[0].message.content
+
+    async def _stream(self, prompt: str):
+        stream = await self.client.chat.completions.create(
+            model=self.provider_model,
+            temperature=self.temperature,
+            max_tokens=self.max_tokens,
+            messages=[{"role": "user", "content": prompt}],
+            stream=True,
+            timeout=self.timeout,
+        )
+        async with stream:
+            # The headers arrive before the first chunk; a stopped stream never reaches a final response
+            self._check_rate_limit_headers(stream.response.headers)
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+    def _classify_error(self, error: Exception) -> Optional[str]:
+        if isinstance(error, RateLimitError):
+            return self.RATE_LIMITED
+        # Connection failures, timeouts and 5xx replies are retried; other 4xx errors
+        # (bad key, unknown model, malformed request) would fail again, so they are raised
+        if isinstance(error, (APIConnectionError, APITimeoutError, InternalServerError)):
+            return self.TRANSIENT
+        if isinstance(error, APIStatusError) and error.status_code >= 500:
+            return self.TRANSIENT
+        return None
@@ -4,6 +4,8 @@ class PromptCreator:
    
     def __init__(self, lang, prompt_template, n_rounds, n_rounds_known, payoff_matrix):
         self.language = lang
+        # fill_template edits prompt_template in place, so each call starts again from the original
+        self.template = prompt_template
         self.prompt_template = prompt_template
         self.n_rounds = n_rounds
         self.n_rounds_known = n_rounds_known
@@ -143,6 +145,8 @@ class PromptCreator:
         4) Format and return the final prompt.
         """
 
+        self.prompt_template = self.template
+
         # 1) Build placeholders
         placeholder_value_dict = self.map_placeholders(agent.name, opponents, current_round, history)
 
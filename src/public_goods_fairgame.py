@@ -2,6 +2,7 @@
 from src.fairgame import FairGame
 from src.public_goods_payoff_matrix import PublicGoodsPayoffMatrix
 from src.public_goods_game_round import PublicGoodsGameRound
+from src.public_goods_prompt_creator import PublicGoodsPromptCreator
 
 
 class PublicGoodsFairGame(FairGame):
@@ -34,7 +35,7 @@ class PublicGoodsFairGame(FairGame):
         self.name = name
         self.language = language
         self.agents = agents
-        self.n_rounds = int(n_rounds)
+        self.n_rounds = self._str2int(n_rounds)
         self.n_rounds_known = self._str2bool(n_rounds_known)
         self.prompt_template = prompt_template
         self.stop_conditions = stop_conditions
@@ -53,18 +54,23 @@ class PublicGoodsFairGame(FairGame):
             public_goods_config
         )
         self.public_goods_config = public_goods_config
+        self._prompt_creator = None
     
-    def _str2bool(self, value):
+    @property
+    def prompt_creator(self):
         """
-        Convert a string or bool to a boolean value.
-        
-        Args:
-            value (str or bool): The value to interpret as bool.
-        
-        Returns:
-            bool: The interpreted boolean value.
+        PublicGoodsPromptCreator: The prompt creator shared by every round, built on first use.
         """
-        return value if isinstance(value, bool) else value.strip().lower() == 'true'
+        if self._prompt_creator is None:
+            self._prompt_creator = PublicGoodsPromptCreator(
+                self.language,
+                self.prompt_template,
+                self.n_rounds,
+                self.n_rounds_known,
+                self.payoff_matrix,
+                self.public_goods_config
+            )
+        return self._prompt_creator
     
     @property
     def description(self):
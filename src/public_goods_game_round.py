@@ -1,6 +1,9 @@
 
+import asyncio
+import re
+
 from src.game_round import GameRound
-from src.public_goods_prompt_creator import PublicGoodsPromptCreator
+from src.llm_connectors.event_loop import run_coroutine
 
 
 class PublicGoodsGameRound(GameRound):
@@ -8,11 +11,80 @@ class PublicGoodsGameRound(GameRound):
     Specialized GameRound for Public Goods Game.
     
     Uses PublicGoodsPromptCreator to handle public goods specific template variables.
+    Strategy prompts are sent to all agents concurrently.
     """
-    
+
+    def run(self):
+        """
+        Execute one round of the game.
+
+        The communication phase stays sequential because each message is added to the
+        history the next agent sees. Strategy prompts only depend on previous rounds,
+        so they are built up front and sent to all agents at once.
+
+        Returns:
+            list of str: The list of strategy keys (not names) chosen by agents this round.
+        """
+        if self.game.agents_communicate:
+            self._execute_communication_phase()
+
+        agents = list(self.game.agents.values())
+        prompts = [self.create_prompt(agent, phase='choose') for agent in agents]
+        responses = run_coroutine(self._request_strategies(agents, prompts))
+
+        round_strategies = []
+        for agent, prompt, response in zip(agents, prompts, responses):
+            strategy = self._record_strategy(agent, response)
+            if strategy is None:
+                # Fall back to re-prompting this agent with the usual retries
+                strategy = self._execute_agent_strategy(agent, prompt)
+            round_strategies.append(strategy)
+
+        return round_strategies
+
+    async def _request_strategies(self, agents, prompts):
+        """
+        Send every agent its strategy prompt concurrently.
+
+        Replies are streamed and cut off once a strategy name appears.
+
+        Args:
+            agents (list): The agents, in turn order.
+            prompts (list of str): The strategy prompt for each agent.
+
+        Returns:
+            list of str: The raw responses, in the same order as the agents.
+
+        Raises:
+            CircuitOpen: If an agent's provider is down and its circuit breaker is open.
+            TimeoutError: If an agent's provider did not answer within its time budget.
+                          In both cases the other requests are awaited first, so none is
+                          left running.
+        """
+        # The choose prompt asks for the choice only, so stop reading at the first strategy name
+        stop_pattern = self._strategy_pattern()
+        responses = await asyncio.gather(
+            *(agent.execute_round_async(prompt, stop_pattern=stop_pattern) for agent, prompt in zip(agents, prompts)),
+            return_exceptions=True
+        )
+        for response in responses:
+            if isinstance(response, BaseException):
+                raise response
+        return responses
+
+    def _strategy_pattern(self):
+        """
+        Build a case-insensitive pattern matching any strategy name, as _record_strategy does.
+
+        Returns:
+            re.Pattern: The compiled pattern.
+        """
+        names = self.game.payoff_matrix.strategies.values()
+        return re.compile("|".join(re.escape(name) for name in names), re.IGNORECASE)
+
     def create_prompt(self, agent, phase):
         """
-        Create a prompt for an agent using the PublicGoodsPromptCreator.
+        Create a prompt for an agent using the game's PublicGoodsPromptCreator.
         
         Args:
             agent: The agent object to create the prompt for.
@@ -22,15 +94,7 @@ class PublicGoodsGameRound(GameRound):
             str: The prompt to be sent to the agent.
         """
         opponents = self._get_opponents(agent)
-        prompt_creator = PublicGoodsPromptCreator(
-            self.game.language,
-            self.game.prompt_template,
-            self.game.n_rounds,
-            self.game.n_rounds_known,
-            self.game.payoff_matrix,
-            self.game.public_goods_config
-        )
-        return prompt_creator.fill_template(
+        return self.game.prompt_creator.fill_template(
             agent,
             opponents,
             self.round_number,
@@ -1,6 +1,15 @@
 
+import functools
+import numbers
+import sys
+
+import numpy as np
+
 from src.payoff_matrix import PayoffMatrix
 
+# Strategy key for "contribute"
+CONTRIBUTE_KEY = sys.intern('strategy1')
+
 
 class PublicGoodsPayoffMatrix(PayoffMatrix):
     """
@@ -29,6 +38,31 @@ class PublicGoodsPayoffMatrix(PayoffMatrix):
         self.contribution_cost = public_goods_config['contributionCost']
         self.multiplication_factor = public_goods_config['multiplicationFactor']
         self.num_agents = public_goods_config['numAgents']
+        # Strategies are fixed after construction, so the name lookup is built once
+        self._name_to_key = {name: sys.intern(key) for key, name in self.strategies.items()}
+        self._contribute_key = CONTRIBUTE_KEY
+        # Single source of every payoff: row k holds the (free-rider, contributor) payoffs
+        # when k agents contribute; all payoff methods read from this table
+        self._payoff_table = self._build_payoff_table()
+        self._pair_by_k = [tuple(row) for row in self._payoff_table.tolist()]
+        self._combo_keys = [f'combination_{k}_contributors' for k in range(self.num_agents + 1)]
+        # Only 2 ** num_agents contribution patterns exist, and repeated games revisit them
+        self._weights_cached = functools.lru_cache(maxsize=2 ** self.num_agents)(self._compute_weights)
+    
+    def _build_payoff_table(self):
+        """
+        Build the (num_agents + 1, 2) table of (free-rider, contributor) payoffs.
+        
+        The pool share is evaluated as ((k * cost) * factor) / n, like the original formula.
+        
+        Returns:
+            np.ndarray: float64 payoffs, indexed by [num_contributors, contributed].
+        """
+        share = (
+            np.arange(self.num_agents + 1, dtype=np.float64)
+            * self.contribution_cost * self.multiplication_factor / self.num_agents
+        )
+        return np.column_stack((share, share - self.contribution_cost))
     
     def calculate_payoff(self, agent_contributed, num_contributors):
         """
@@ -41,12 +75,22 @@ class PublicGoodsPayoffMatrix(PayoffMatrix):
         Returns:
             float: The payoff for this agent.
         """
-        total_contributions = num_contributors * self.contribution_cost
-        pool_value = total_contributions * self.multiplication_factor
-        equal_share = pool_value / self.num_agents
+        return self._pair_by_k[num_contributors][int(agent_contributed)]
+    
+    def calculate_payoffs(self, contributed, num_contributors):
+        """
+        Calculate the payoffs of several agents at once.
+        
+        Reads the same payoff table as calculate_payoff, so results are identical.
         
-        individual_cost = self.contribution_cost if agent_contributed else 0
-        return equal_share - individual_cost
+        Args:
+            contributed (np.ndarray): 1 for each agent who contributed, 0 otherwise.
+            num_contributors (int or np.ndarray): Total number of agents who contributed.
+        
+        Returns:
+            np.ndarray: The payoff of each agent.
+        """
+        return self._payoff_table[num_contributors, np.asarray(contributed, dtype=np.intp)]
     
     def attribute_scores(self, agents, round_strategies):
         """
@@ -56,18 +100,39 @@ class PublicGoodsPayoffMatrix(PayoffMatrix):
             agents (list): List of agent objects.
             round_strategies (list of str): Strategy keys chosen by each agent.
         """
-        # Get the strategy key for "contribute" (strategy1)
-        contribute_key = 'strategy1'
-        
-        # Count total contributors
-        num_contributors = sum(1 for strategy in round_strategies if strategy == contribute_key)
+        contribute_key = self._contribute_key
+        contributed = np.fromiter(
+            (strategy == contribute_key for strategy in round_strategies),
+            dtype=np.int8,
+            count=len(round_strategies)
+        )
+        payoffs = self._payoff_table[contributed.sum(), contributed]
         
         # Assign payoffs to each agent
-        for agent, strategy in zip(agents, round_strategies):
-            agent_contributed = (strategy == contribute_key)
-            payoff = self.calculate_payoff(agent_contributed, num_contributors)
+        for agent, payoff in zip(agents, payoffs.tolist()):
             agent.add_score(payoff)
     
+    def attribute_scores_batch(self, agents, all_round_strategies):
+        """
+        Calculate and attribute the scores of several rounds at once.
+        
+        The payoffs of all rounds are computed as one (rounds x agents) array, and
+        each agent's scores are extended once with its column.
+        
+        Args:
+            agents (list): List of agent objects.
+            all_round_strategies (list of list of str): Strategy keys chosen by each agent, per round.
+        
+        Returns:
+            np.ndarray: The payoffs, one row per round and one column per agent.
+        """
+        contributed = (np.asarray(all_round_strategies) == self._contribute_key).astype(np.int8)
+        payoffs = self.calculate_payoffs(contributed, contributed.sum(axis=1, keepdims=True))
+        
+        for agent, agent_payoffs in zip(agents, payoffs.T.tolist()):
+            agent.extend_scores(agent_payoffs)
+        return payoffs
+    
     def get_weights_for_combination(self, strategy_list):
         """
         Override to calculate weights dynamically based on contribution counts.
@@ -76,32 +141,87 @@ class PublicGoodsPayoffMatrix(PayoffMatrix):
             strategy_list (list of str): Strategy names chosen by agents.
         
         Returns:
-            tuple: Tuple of payoff values for each agent.
+            tuple: Tuple of payoff values (floats) for each agent.
+        """
+        return self._weights_cached(tuple(strategy_list))
+    
+    def _compute_weights(self, strategy_names):
         """
-        name_to_key = {name: key for key, name in self.strategies.items()}
-        key_list = [name_to_key.get(strategy_name) for strategy_name in strategy_list]
+        Compute the payoff tuple of a strategy combination; cached by get_weights_for_combination.
+        """
+        name_to_key = self._name_to_key
+        contribute_key = self._contribute_key
+        # One pass fills the mask and counts the contributors
+        mask = bytearray(len(strategy_names))
+        num_contributors = 0
+        for i, strategy_name in enumerate(strategy_names):
+            if name_to_key.get(strategy_name) == contribute_key:
+                mask[i] = 1
+                num_contributors += 1
+        pair = self._pair_by_k[num_contributors]
         
-        contribute_key = 'strategy1'
-        num_contributors = sum(1 for key in key_list if key == contribute_key)
+        return tuple(pair[contributed] for contributed in mask)
+    
+    def contribution_mask(self, round_strategies):
+        """
+        Encode the strategy keys of a round as an int bitmask.
         
-        payoffs = []
-        for strategy_key in key_list:
-            agent_contributed = (strategy_key == contribute_key)
-            payoff = self.calculate_payoff(agent_contributed, num_contributors)
-            payoffs.append(payoff)
+        Args:
+            round_strategies (list of str): Strategy keys chosen by each agent.
         
-        return tuple(payoffs)
+        Returns:
+            int: Bit i is set if agent i contributed.
+        """
+        contribute_key = self._contribute_key
+        mask = 0
+        for i, strategy in enumerate(round_strategies):
+            if strategy == contribute_key:
+                mask |= 1 << i
+        return mask
+    
+    def _check_mask(self, mask):
+        # Any integer type (e.g. numpy.int64) is a mask; bool is not, despite being an int
+        if isinstance(mask, bool) or not isinstance(mask, numbers.Integral):
+            raise TypeError(f"Contribution mask must be an integer, not {type(mask).__name__}.")
+        mask = int(mask)
+        if mask < 0 or mask >> self.num_agents:
+            raise ValueError(f"Contribution mask {mask:#b} does not fit {self.num_agents} agents.")
+        return mask
+    
+    def weights_from_mask(self, mask):
+        """
+        Payoff tuple for a contribution bitmask, the int counterpart of get_weights_for_combination.
+        
+        Args:
+            mask (int): Bit i is set if agent i contributed; any integer type, but not bool.
+        
+        Returns:
+            tuple: Tuple of payoff values for each of the num_agents agents.
+        
+        Raises:
+            TypeError: If the mask is not an integer, or is a bool.
+            ValueError: If the mask is negative or has bits at or above num_agents.
+        """
+        mask = self._check_mask(mask)
+        pair = self._pair_by_k[mask.bit_count()]
+        return tuple(pair[(mask >> i) & 1] for i in range(self.num_agents))
     
     def get_combination_key(self, round_strategies):
         """
         Generate a combination key based on the number of contributors.
         
         Args:
-            round_strategies (list of str): Strategy keys selected for a round.
+            round_strategies (list of str or int): Strategy keys selected for a round, or
+                                                   their contribution bitmask.
         
         Returns:
             str: A combination key like 'combination_3_contributors'.
+        
+        Raises:
+            TypeError: If round_strategies is a bool.
+            ValueError: If a bitmask is negative or has bits at or above num_agents.
         """
-        contribute_key = 'strategy1'
-        num_contributors = sum(1 for strategy in round_strategies if strategy == contribute_key)
-        return f'combination_{num_contributors}_contributors'
+        if isinstance(round_strategies, numbers.Integral):
+            mask = self._check_mask(round_strategies)
+            return self._combo_keys[mask.bit_count()]
+        return self._combo_keys[round_strategies.count(self._contribute_key)]
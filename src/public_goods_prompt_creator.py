@@ -1,6 +1,10 @@
+import re
 
 from src.prompt_creator import PromptCreator
 
+# A {placeholder} that is not part of an escaped {{literal}}
+_PLACEHOLDER_RE = re.compile(r"(?<!\{)\{(\w+)\}(?!\})")
+
 
 class PublicGoodsPromptCreator(PromptCreator):
     """
@@ -24,32 +28,22 @@ class PublicGoodsPromptCreator(PromptCreator):
         """
         super().__init__(lang, prompt_template, n_rounds, n_rounds_known, payoff_matrix)
         self.public_goods_config = public_goods_config
+        self._static_placeholders = self._compute_static_placeholders()
+        # Substitute the constant values once, so each prompt only formats the per-call ones
+        self.template = self._specialize_template(self.template)
+        self.prompt_template = self.template
     
-    def map_placeholders(self, agent_name, opponents, current_round, history):
+    def _compute_static_placeholders(self):
         """
-        Build the dictionary of placeholders including public goods specific values.
-        
-        Args:
-            agent_name (str): Name of the current agent.
-            opponents (list): List of opponent agents.
-            current_round (int): Current round number.
-            history (str): Game history string.
+        Compute the placeholders that only depend on the public goods configuration.
         
         Returns:
-            dict: Dictionary mapping placeholder names to values.
+            dict: The configuration values and example payoff calculations.
         """
-        # Get base placeholders from parent
-        values = super().map_placeholders(agent_name, opponents, current_round, history)
-        
-        # Add public goods specific placeholders
         cost = self.public_goods_config['contributionCost']
         multiplier = self.public_goods_config['multiplicationFactor']
         num_agents = self.public_goods_config['numAgents']
         
-        values['contributionCost'] = cost
-        values['multiplicationFactor'] = multiplier
-        values['numAgents'] = num_agents
-        
         # Calculate example scenarios
         # If all contribute
         total_if_all_contribute = cost * num_agents
@@ -57,16 +51,59 @@ class PublicGoodsPromptCreator(PromptCreator):
         payoff_if_all_contribute = pool_if_all_contribute / num_agents
         net_gain_if_all_contribute = payoff_if_all_contribute - cost
         
-        values['totalIfAllContribute'] = total_if_all_contribute
-        values['payoffIfAllContribute'] = payoff_if_all_contribute
-        values['netGainIfAllContribute'] = net_gain_if_all_contribute
-        
         # If only one contributes (solo contribution)
         solo_pool = cost * multiplier
         solo_contribution_return = solo_pool / num_agents
         solo_contribution_net = solo_contribution_return - cost
         
-        values['soloContributionReturn'] = solo_contribution_return
-        values['soloContributionNet'] = solo_contribution_net
+        return {
+            'contributionCost': cost,
+            'multiplicationFactor': multiplier,
+            'numAgents': num_agents,
+            'totalIfAllContribute': total_if_all_contribute,
+            'payoffIfAllContribute': payoff_if_all_contribute,
+            'netGainIfAllContribute': net_gain_if_all_contribute,
+            'soloContributionReturn': solo_contribution_return,
+            'soloContributionNet': solo_contribution_net,
+        }
+    
+    def _specialize_template(self, template):
+        """
+        Replace the static placeholders in a template with their values.
+        
+        Values are brace-escaped, since the template is still passed to str.format later.
+        
+        Args:
+            template (str): Template string with placeholders.
+        
+        Returns:
+            str: The template with only the per-call placeholders left.
+        """
+        def substitute(match):
+            key = match.group(1)
+            if key not in self._static_placeholders:
+                return match.group(0)
+            return str(self._static_placeholders[key]).replace('{', '{{').replace('}', '}}')
+        
+        return _PLACEHOLDER_RE.sub(substitute, template)
+    
+    def map_placeholders(self, agent_name, opponents, current_round, history):
+        """
+        Build the dictionary of placeholders including public goods specific values.
+        
+        Args:
+            agent_name (str): Name of the current agent.
+            opponents (list): List of opponent agents.
+            current_round (int): Current round number.
+            history (str): Game history string.
+        
+        Returns:
+            dict: Dictionary mapping placeholder names to values.
+        """
+        # Get base placeholders from parent
+        values = super().map_placeholders(agent_name, opponents, current_round, history)
+        
+        # Add public goods specific placeholders, computed once in __init__
+        values.update(self._static_placeholders)
         
         return values
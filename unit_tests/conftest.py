@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+# Make the repository root importable once for the whole test session
+ROOT = str(Path(__file__).resolve().parent.parent)
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
@@ -0,0 +1,456 @@
+"""
+Unit tests for the AIMD concurrency controller, circuit breaker and streaming used by the LLM connectors.
+"""
+
+import asyncio
+import os
+import re
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import anthropic
+import httpx
+import openai
+import requests
+from mistralai.models import SDKError
+
+# Running this file directly (python unit_tests/test_backpressure.py) bypasses conftest.py
+ROOT = str(Path(__file__).resolve().parent.parent)
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from src.llm_connectors.abstract_connector import AbstractConnector
+from src.llm_connectors.anthropic_connector import AnthropicConnector
+from src.llm_connectors.mistral_connector import MistralConnector
+from src.llm_connectors.openai_connector import OpenAIConnector
+from src.llm_connectors.backpressure import (
+    ConcurrencyController, SlidingWindow, get_controller, get_window, set_process_count
+)
+from src.llm_connectors.circuit_breaker import CircuitBreaker, CircuitOpen, get_breaker
+
+
+class TestConcurrencyController(unittest.TestCase):
+    """Test the limit adjustments and slot accounting."""
+
+    def test_additive_increase_on_fast_response(self):
+        controller = ConcurrencyController(initial_limit=4, target_latency=1.0)
+        controller.record_success(0.5)
+        self.assertEqual(controller.limit, 4.5)
+
+    def test_multiplicative_decrease_on_slow_window(self):
+        controller = ConcurrencyController(initial_limit=4, target_latency=1.0)
+        controller.record_success(3.0)
+        self.assertEqual(controller.limit, 2.0)
+
+    def test_multiplicative_decrease_on_failure(self):
+        controller = ConcurrencyController(initial_limit=8)
+        controller.record_failure()
+        self.assertEqual(controller.limit, 4.0)
+
+    def test_limit_is_clamped(self):
+        controller = ConcurrencyController(initial_limit=2, min_limit=1, max_limit=2.5)
+        for _ in range(5):
+            controller.record_success(0.0)
+        self.assertEqual(controller.limit, 2.5)
+        for _ in range(5):
+            controller.record_failure()
+        self.assertEqual(controller.limit, 1)
+
+    def test_slot_bounds_in_flight_requests(self):
+        controller = ConcurrencyController(initial_limit=2, max_limit=2)
+        peak = 0
+
+        async def request():
+            nonlocal peak
+            async with controller.slot():
+                peak = max(peak, controller.in_flight)
+                await asyncio.sleep(0.01)
+
+        async def run_all():
+            await asyncio.gather(*(request() for _ in range(6)))
+
+        asyncio.run(run_all())
+        self.assertEqual(peak, 2)
+        self.assertEqual(controller.in_flight, 0)
+
+    def test_pause_holds_new_requests(self):
+        controller = ConcurrencyController()
+
+        async def run_all():
+            loop = asyncio.get_running_loop()
+            controller.pause(0.1)
+            start = loop.time()
+            async with controller.slot():
+                return loop.time() - start
+
+        self.assertGreaterEqual(asyncio.run(run_all()), 0.09)
+
+
+class TestSlidingWindow(unittest.TestCase):
+    """Test the per-minute request and token limits."""
+
+    def _time_requests(self, window, token_counts):
+        async def run_all():
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            for tokens in token_counts:
+                await window.wait_if_throttled(tokens)
+            return loop.time() - start
+
+        return asyncio.run(run_all())
+
+    def test_requests_within_limits_do_not_wait(self):
+        window = SlidingWindow(rpm=3, tpm=100, window=0.2)
+        self.assertLess(self._time_requests(window, [10, 10, 10]), 0.1)
+
+    def test_request_limit_waits_for_window(self):
+        window = SlidingWindow(rpm=2, tpm=100, window=0.2)
+        self.assertGreaterEqual(self._time_requests(window, [10, 10, 10]), 0.19)
+
+    def test_token_limit_waits_for_window(self):
+        window = SlidingWindow(rpm=10, tpm=100, window=0.2)
+        self.assertGreaterEqual(self._time_requests(window, [60, 60]), 0.19)
+
+    def test_window_profile_lookup(self):
+        self.assertEqual(get_window("gpt-4o").rpm, 500)
+        self.assertIsNone(get_window("unknown-model"))
+
+    def test_process_count_splits_limits(self):
+        self.addCleanup(set_process_count, 1)
+        set_process_count(4)
+        window = get_window("gpt-4o")
+        self.assertEqual((window.rpm, window.tpm), (125, 7500))
+        set_process_count(1)
+        self.assertEqual(get_window("gpt-4o").rpm, 500)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Test the CLOSED/OPEN/HALF_OPEN transitions."""
+
+    def test_opens_after_consecutive_failures(self):
+        breaker = CircuitBreaker("test", failure_threshold=3, cooldown=60)
+        for _ in range(3):
+            breaker.before_call()
+            breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        with self.assertRaises(CircuitOpen):
+            breaker.before_call()
+
+    def test_success_resets_failure_count(self):
+        breaker = CircuitBreaker("test", failure_threshold=2)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_half_open_allows_a_single_probe(self):
+        breaker = CircuitBreaker("test", failure_threshold=1, cooldown=0)
+        breaker.record_failure()
+        breaker.before_call()
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+        with self.assertRaises(CircuitOpen):
+            breaker.before_call()
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_failed_probe_reopens(self):
+        breaker = CircuitBreaker("test", failure_threshold=5, cooldown=0)
+        breaker.state = CircuitBreaker.OPEN
+        breaker.before_call()
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+
+    def test_release_frees_unrecorded_probe(self):
+        breaker = CircuitBreaker("test", failure_threshold=1, cooldown=0)
+        breaker.record_failure()
+        probe = breaker.before_call()
+        self.assertTrue(probe)
+        breaker.release(probe)
+        self.assertTrue(breaker.before_call())
+
+    def test_release_of_closed_call_keeps_probe(self):
+        breaker = CircuitBreaker("test", failure_threshold=1, cooldown=0)
+        closed_call = breaker.before_call()
+        breaker.record_failure()
+        breaker.before_call()
+        breaker.release(closed_call)
+        with self.assertRaises(CircuitOpen):
+            breaker.before_call()
+
+
+
+class TestForkReset(unittest.TestCase):
+    """Test that a forked child gets fresh controller, window and breaker registries."""
+
+    @unittest.skipUnless(hasattr(os, "fork"), "requires os.fork")
+    def test_child_does_not_share_registries(self):
+        inherited = (get_controller("test-fork"), get_breaker("test-fork"), get_window("gpt-4o"))
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            fresh = (get_controller("test-fork"), get_breaker("test-fork"), get_window("gpt-4o"))
+            os.write(write_fd, b"1" if all(new is not old for new, old in zip(fresh, inherited)) else b"0")
+            os._exit(0)
+        os.close(write_fd)
+        with os.fdopen(read_fd, "rb") as reader:
+            result = reader.read()
+        os.waitpid(pid, 0)
+        self.assertEqual(result, b"1")
+
+
+class FailingConnector(AbstractConnector):
+    """Connector whose every call raises the given error, classified as given."""
+
+    provider = "test-failing"
+
+    def __init__(self, error, kind):
+        super().__init__("test-model", retry_delay=0.0, total_budget=0.0)
+        self.error = error
+        self.kind = kind
+        self.breaker = CircuitBreaker("test", failure_threshold=1, cooldown=60)
+
+    async def _complete(self, prompt):
+        raise self.error
+
+    async def _stream(self, prompt):
+        raise self.error
+        yield
+
+    def _classify_error(self, error):
+        return self.kind
+
+
+class TestConnectorBreaker(unittest.TestCase):
+    """Test which failed calls the connector reports to its circuit breaker."""
+
+    def test_client_error_does_not_open_breaker(self):
+        connector = FailingConnector(ValueError("bad request"), None)
+        with self.assertRaises(ValueError):
+            asyncio.run(connector._send_with_retries("prompt"))
+        self.assertEqual(connector.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_transient_error_opens_breaker(self):
+        connector = FailingConnector(ConnectionError("reset"), AbstractConnector.TRANSIENT)
+        with self.assertRaises(TimeoutError):
+            asyncio.run(connector._send_with_retries("prompt"))
+        self.assertEqual(connector.breaker.state, CircuitBreaker.OPEN)
+
+    def test_client_error_on_probe_releases_half_open_breaker(self):
+        connector = FailingConnector(ValueError("bad request"), None)
+        connector.breaker.cooldown = 0
+        connector.breaker.record_failure()
+        with self.assertRaises(ValueError):
+            asyncio.run(connector._send_with_retries("prompt"))
+        self.assertEqual(connector.breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertTrue(connector.breaker.before_call())
+
+
+
+def make_connector(connector_class, module_name, error):
+    """Build a real provider connector, without API keys, whose every call raises error."""
+    with mock.patch(f"{module_name}.get_api_key", return_value="test-key"), \
+            mock.patch(f"{module_name}._{connector_class.provider}_client"):
+        connector = connector_class("test-model", retry_delay=0.0)
+    connector.calls = 0
+
+    async def complete(prompt):
+        connector.calls += 1
+        raise error
+
+    connector._complete = complete
+    connector.breaker = CircuitBreaker("test", failure_threshold=1, cooldown=60)
+    connector.controller = ConcurrencyController(initial_limit=8)
+    return connector
+
+
+def status_error(error_class, status_code):
+    request = httpx.Request("POST", "https://api.example.com/v1")
+    return error_class("error", response=httpx.Response(status_code, request=request), body=None)
+
+
+PROVIDER_SDKS = (
+    (AnthropicConnector, "src.llm_connectors.anthropic_connector", anthropic),
+    (OpenAIConnector, "src.llm_connectors.openai_connector", openai),
+)
+
+
+class TestProviderErrorClassification(unittest.TestCase):
+    """Test the Anthropic and OpenAI classifiers on real SDK errors."""
+
+    def test_client_errors_are_raised_at_once(self):
+        for connector_class, module_name, sdk in PROVIDER_SDKS:
+            for error_class, status_code in ((sdk.BadRequestError, 400), (sdk.AuthenticationError, 401)):
+                with self.subTest(connector=connector_class.__name__, status=status_code):
+                    error = status_error(error_class, status_code)
+                    connector = make_connector(connector_class, module_name, error)
+                    self.assertIsNone(connector._classify_error(error))
+                    with self.assertRaises(error_class):
+                        asyncio.run(connector._send_with_retries("prompt"))
+                    self.assertEqual(connector.calls, 1)
+                    self.assertEqual(connector.breaker.state, CircuitBreaker.CLOSED)
+                    self.assertEqual(connector.breaker.failure_count, 0)
+                    self.assertEqual(connector.controller.limit, 8)
+
+    def test_server_and_connection_errors_are_transient(self):
+        for connector_class, module_name, sdk in PROVIDER_SDKS:
+            request = httpx.Request("POST", "https://api.example.com/v1")
+            errors = (
+                status_error(sdk.InternalServerError, 500),
+                status_error(sdk.APIStatusError, 503),
+                sdk.APIConnectionError(request=request),
+                sdk.APITimeoutError(request=request),
+            )
+            connector = make_connector(connector_class, module_name, errors[0])
+            for error in errors:
+                with self.subTest(connector=connector_class.__name__, error=type(error).__name__):
+                    self.assertEqual(connector._classify_error(error), AbstractConnector.TRANSIENT)
+            rate_limited = status_error(sdk.RateLimitError, 429)
+            self.assertEqual(connector._classify_error(rate_limited), AbstractConnector.RATE_LIMITED)
+
+    def test_client_errors_leave_concurrency_limit_unchanged(self):
+        response = httpx.Response(404, request=httpx.Request("POST", "https://api.example.com/v1"))
+        http_error = requests.HTTPError("not found", response=requests.Response())
+        http_error.response.status_code = 404
+        cases = [
+            (connector_class, module_name, status_error(sdk.NotFoundError, 404))
+            for connector_class, module_name, sdk in PROVIDER_SDKS
+        ] + [
+            (MistralConnector, "src.llm_connectors.mistral_connector", SDKError("not found", response)),
+            (MistralConnector, "src.llm_connectors.mistral_connector", http_error),
+        ]
+        for connector_class, module_name, error in cases:
+            with self.subTest(connector=connector_class.__name__, error=type(error).__name__):
+                connector = make_connector(connector_class, module_name, error)
+                with self.assertRaises(type(error)):
+                    asyncio.run(connector._send_with_retries("prompt"))
+                self.assertEqual(connector.controller.limit, 8)
+
+
+class StreamingConnector(AbstractConnector):
+    """Connector that streams the given chunks and records how far the stream was read."""
+
+    provider = "test-streaming"
+
+    def __init__(self, chunks):
+        super().__init__("test-model")
+        self.chunks = chunks
+        self.yielded = 0
+        self.closed = False
+
+    async def _complete(self, prompt):
+        return "".join(self.chunks)
+
+    async def _stream(self, prompt):
+        try:
+            for chunk in self.chunks:
+                self.yielded += 1
+                yield chunk
+        finally:
+            self.closed = True
+
+    def _classify_error(self, error):
+        return None
+
+
+class FakeOpenAIStream:
+    """Stand-in for openai.AsyncStream: response headers plus async iteration over chunks."""
+
+    def __init__(self, headers, texts):
+        self.response = httpx.Response(200, headers=headers)
+        self.texts = texts
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def __aiter__(self):
+        for text in self.texts:
+            yield mock.Mock(choices=[mock.Mock(delta=mock.Mock(content=text))])
+
+
+class FakeAnthropicStream:
+    """Stand-in for the manager returned by messages.stream: response headers plus text_stream."""
+
+    def __init__(self, headers, texts):
+        self.response = httpx.Response(200, headers=headers)
+        self.texts = texts
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    @property
+    async def text_stream(self):
+        for text in self.texts:
+            yield text
+
+
+class TestStreaming(unittest.TestCase):
+    """Test the early-stopping stream used for strategy prompts."""
+
+    def test_complete_until_stops_at_first_match_and_closes_stream(self):
+        connector = StreamingConnector(["I choose ", "Contribute", " because", " it pays"])
+        text = asyncio.run(connector._complete_until("prompt", re.compile("Contribute|Free-ride")))
+        self.assertEqual(text, "I choose Contribute")
+        self.assertEqual(connector.yielded, 2)
+        self.assertTrue(connector.closed)
+
+    def test_complete_until_reads_whole_stream_without_match(self):
+        connector = StreamingConnector(["no ", "strategy"])
+        text = asyncio.run(connector._complete_until("prompt", re.compile("Contribute")))
+        self.assertEqual(text, "no strategy")
+        self.assertTrue(connector.closed)
+
+    def test_stream_checks_rate_limit_headers(self):
+        cases = (
+            (OpenAIConnector, "src.llm_connectors.openai_connector",
+             {"x-ratelimit-remaining-requests": "1", "x-ratelimit-limit-requests": "500",
+              "x-ratelimit-reset-requests": "2s"},
+             lambda connector, stream: setattr(
+                 connector.client.chat.completions, "create", mock.AsyncMock(return_value=stream)),
+             FakeOpenAIStream),
+            (AnthropicConnector, "src.llm_connectors.anthropic_connector",
+             {"anthropic-ratelimit-requests-remaining": "1", "anthropic-ratelimit-requests-limit": "500"},
+             lambda connector, stream: setattr(
+                 connector.client.messages, "stream", mock.Mock(return_value=stream)),
+             FakeAnthropicStream),
+        )
+        for connector_class, module_name, headers, install, stream_class in cases:
+            with self.subTest(connector=connector_class.__name__):
+                connector = make_connector(connector_class, module_name, None)
+                install(connector, stream_class(headers, ["Contribute"]))
+                with mock.patch.object(connector, "_pause_if_low_capacity") as pause:
+                    text = asyncio.run(connector._complete_until("prompt", re.compile("Contribute")))
+                self.assertEqual(text, "Contribute")
+                remaining_requests = [call.args[1] for call in pause.call_args_list if call.args[0] == "requests"]
+                self.assertEqual(remaining_requests, [1.0])
+
+
+class TestConnectorCache(unittest.TestCase):
+    """Test the per-prompt response cache of deterministic connectors."""
+
+    def test_failed_request_releases_its_lock(self):
+        connector = FailingConnector(ValueError("bad request"), None)
+        connector.temperature = 0
+        with self.assertRaises(ValueError):
+            asyncio.run(connector.send_prompt_async("prompt"))
+        self.assertEqual(connector._cache_locks, {})
+
+    def test_default_temperature_bypasses_cache(self):
+        connector = FailingConnector(ValueError("bad request"), None)
+        with self.assertRaises(ValueError):
+            asyncio.run(connector.send_prompt_async("prompt"))
+        self.assertEqual(connector._cache_locks, {})
+        self.assertEqual(len(connector._cache), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
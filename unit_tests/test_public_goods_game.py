@@ -5,15 +5,82 @@ Tests the core components of the Public Goods Game implementation including
 the payoff matrix, game mechanics, and prompt creation.
 """
 
+import asyncio
+import os
+import time
 import unittest
+import numpy as np
 from pathlib import Path
 import sys
 
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+# Running this file directly (python unit_tests/test_public_goods_game.py) bypasses conftest.py
+ROOT = str(Path(__file__).resolve().parent.parent)
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
 
 from src.public_goods_payoff_matrix import PublicGoodsPayoffMatrix
+from src.public_goods_fairgame import PublicGoodsFairGame
+from src.public_goods_game_round import PublicGoodsGameRound
+from src.public_goods_prompt_creator import PublicGoodsPromptCreator
 from src.agent import Agent
+from src.llm_connectors.circuit_breaker import CircuitOpen
+
+_CONFIG_PATH = Path("resources/config/public_goods_game/public_goods_game_round_known.json")
+_EN_TEMPLATE = Path("resources/game_templates/public_goods_game_en.txt")
+_VN_TEMPLATE = Path("resources/game_templates/public_goods_game_vn.txt")
+
+
+def make_agents(count):
+    """
+    Create plain agents named agent0, agent1, ... for payoff tests.
+    """
+    return [Agent(f"agent{i}", "TestLLM", "None", 0) for i in range(count)]
+
+
+class StubAgent(Agent):
+    """
+    Agent that answers with a fixed reply after a short delay instead of calling an LLM.
+    
+    The class counts the async calls in flight, so tests can check that agents are
+    prompted concurrently without measuring wall-clock time.
+    """
+
+    in_flight = 0
+    peak_in_flight = 0
+
+    def __init__(self, name, reply, delay=0.2):
+        super().__init__(name, "TestLLM", "None", 0)
+        self.reply = reply
+        self.delay = delay
+
+    def execute_round(self, prompt):
+        time.sleep(self.delay)
+        return self.reply
+
+    async def execute_round_async(self, prompt, stop_pattern=None):
+        StubAgent.in_flight += 1
+        StubAgent.peak_in_flight = max(StubAgent.peak_in_flight, StubAgent.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            StubAgent.in_flight -= 1
+        return self.reply
+
+
+class UnreachableAgent(Agent):
+    """
+    Agent whose provider cannot be reached: its calls raise the given error.
+    """
+
+    def __init__(self, name, error=None):
+        super().__init__(name, "TestLLM", "None", 0)
+        self.error = error or CircuitOpen("Circuit for TestLLM is open.")
+
+    def execute_round(self, prompt):
+        raise self.error
+
+    async def execute_round_async(self, prompt, stop_pattern=None):
+        raise self.error
 
 
 class TestPublicGoodsPayoffMatrix(unittest.TestCase):
@@ -21,11 +88,12 @@ class TestPublicGoodsPayoffMatrix(unittest.TestCase):
     Test cases for PublicGoodsPayoffMatrix class.
     """
 
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         """
-        Set up test fixtures.
+        Set up test fixtures shared by all tests; none of them mutates the matrix.
         """
-        self.matrix_data = {
+        cls.matrix_data = {
             "weights": {},
             "strategies": {
                 "en": {
@@ -37,16 +105,16 @@ class TestPublicGoodsPayoffMatrix(unittest.TestCase):
             "matrix": {}
         }
         
-        self.public_goods_config = {
+        cls.public_goods_config = {
             "contributionCost": 10,
             "multiplicationFactor": 2.0,
             "numAgents": 4
         }
         
-        self.payoff_matrix = PublicGoodsPayoffMatrix(
-            self.matrix_data,
+        cls.payoff_matrix = PublicGoodsPayoffMatrix(
+            cls.matrix_data,
             "en",
-            self.public_goods_config
+            cls.public_goods_config
         )
     
     def test_initialization(self):
@@ -81,6 +149,19 @@ class TestPublicGoodsPayoffMatrix(unittest.TestCase):
         )
         self.assertEqual(payoff, 0.0)
     
+    def test_calculate_payoff_empty_pool_is_exact(self):
+        """
+        Test that with no contributors the payoff is exactly 0 or minus the cost,
+        also for a factor that is not a whole number.
+        """
+        fractional_matrix = PublicGoodsPayoffMatrix(
+            self.matrix_data,
+            "en",
+            {"contributionCost": 10, "multiplicationFactor": 1.1, "numAgents": 3}
+        )
+        self.assertEqual(fractional_matrix.calculate_payoff(agent_contributed=False, num_contributors=0), 0.0)
+        self.assertEqual(fractional_matrix.calculate_payoff(agent_contributed=True, num_contributors=0), -10.0)
+    
     def test_calculate_payoff_solo_contributor(self):
         """
         Test payoff calculation when only one agent contributes.
@@ -117,6 +198,23 @@ class TestPublicGoodsPayoffMatrix(unittest.TestCase):
         self.assertEqual(contributor_payoff, 0.0)
         self.assertEqual(freerider_payoff, 10.0)
     
+    def test_calculate_payoff_returns_float(self):
+        """
+        Test that payoffs are floats for whole-number and fractional configurations alike.
+        """
+        payoff = self.payoff_matrix.calculate_payoff(agent_contributed=True, num_contributors=3)
+        self.assertIs(type(payoff), float)
+        self.assertEqual(payoff, 5.0)
+        
+        fractional_matrix = PublicGoodsPayoffMatrix(
+            self.matrix_data,
+            "en",
+            {"contributionCost": 10, "multiplicationFactor": 1.1, "numAgents": 3}
+        )
+        payoff = fractional_matrix.calculate_payoff(agent_contributed=True, num_contributors=2)
+        self.assertIs(type(payoff), float)
+        self.assertEqual(payoff, 2 * 10 * 1.1 / 3 - 10)
+    
     def test_get_weights_for_combination(self):
         """
         Test that get_weights_for_combination returns correct payoffs.
@@ -136,17 +234,48 @@ class TestPublicGoodsPayoffMatrix(unittest.TestCase):
         key = self.payoff_matrix.get_combination_key(round_strategies)
         self.assertEqual(key, "combination_2_contributors")
     
+    def test_contribution_mask(self):
+        """
+        Test that the bitmask API matches the strategy-list API.
+        """
+        round_strategies = ["strategy1", "strategy2", "strategy1", "strategy2"]
+        mask = self.payoff_matrix.contribution_mask(round_strategies)
+        
+        self.assertEqual(mask, 0b0101)
+        self.assertEqual(self.payoff_matrix.get_combination_key(mask), "combination_2_contributors")
+        self.assertEqual(
+            self.payoff_matrix.weights_from_mask(mask),
+            self.payoff_matrix.get_weights_for_combination(["Contribute", "Free-ride", "Contribute", "Free-ride"])
+        )
+    
+    def test_weights_from_mask_rejects_out_of_range_masks(self):
+        """
+        Test that masks with bits beyond num_agents, or negative masks, are rejected.
+        """
+        for mask in (0b10000, 0b11111, -1):
+            with self.assertRaises(ValueError):
+                self.payoff_matrix.weights_from_mask(mask)
+            with self.assertRaises(ValueError):
+                self.payoff_matrix.get_combination_key(mask)
+    
+    def test_mask_accepts_numpy_integers_and_rejects_bools(self):
+        """
+        Test that numpy integer masks work like ints and that bools are not taken as masks.
+        """
+        mask = np.int64(0b0101)
+        self.assertEqual(self.payoff_matrix.get_combination_key(mask), "combination_2_contributors")
+        self.assertEqual(self.payoff_matrix.weights_from_mask(mask), self.payoff_matrix.weights_from_mask(0b0101))
+        for flag in (True, False):
+            with self.assertRaises(TypeError):
+                self.payoff_matrix.get_combination_key(flag)
+            with self.assertRaises(TypeError):
+                self.payoff_matrix.weights_from_mask(flag)
+    
     def test_attribute_scores(self):
         """
         Test that attribute_scores correctly assigns payoffs to agents.
         """
-        # Create mock agents
-        agents = [
-            Agent("agent1", "TestLLM", "cooperative", 0),
-            Agent("agent2", "TestLLM", "selfish", 0),
-            Agent("agent3", "TestLLM", "strategic", 0),
-            Agent("agent4", "TestLLM", "altruistic", 0)
-        ]
+        agents = make_agents(4)
         
         # 3 contribute, 1 free-rides
         round_strategies = ["strategy1", "strategy1", "strategy1", "strategy2"]
@@ -159,6 +288,133 @@ class TestPublicGoodsPayoffMatrix(unittest.TestCase):
         self.assertEqual(agents[1].last_score(), 5.0)
         self.assertEqual(agents[2].last_score(), 5.0)
         self.assertEqual(agents[3].last_score(), 15.0)
+    
+    def test_payoff_paths_agree(self):
+        """
+        Test that every payoff method returns the same values, for a fractional configuration too.
+        """
+        fractional_matrix = PublicGoodsPayoffMatrix(
+            self.matrix_data,
+            "en",
+            {"contributionCost": 1.7, "multiplicationFactor": 1.1, "numAgents": 3}
+        )
+        round_strategies = ["strategy1", "strategy2", "strategy1"]
+        strategy_names = ["Contribute", "Free-ride", "Contribute"]
+        contributed = [True, False, True]
+        
+        agents = make_agents(3)
+        fractional_matrix.attribute_scores(agents, round_strategies)
+        expected = [fractional_matrix.calculate_payoff(c, 2) for c in contributed]
+        
+        self.assertEqual([agent.last_score() for agent in agents], expected)
+        self.assertEqual(list(fractional_matrix.get_weights_for_combination(strategy_names)), expected)
+        self.assertEqual(list(fractional_matrix.weights_from_mask(0b101)), expected)
+        self.assertEqual(fractional_matrix.calculate_payoffs(np.array(contributed), 2).tolist(), expected)
+    
+    def test_attribute_scores_batch(self):
+        """
+        Test that attribute_scores_batch matches attributing the rounds one by one.
+        """
+        all_round_strategies = [
+            ["strategy1", "strategy1", "strategy1", "strategy2"],
+            ["strategy2", "strategy2", "strategy2", "strategy2"],
+            ["strategy1", "strategy2", "strategy1", "strategy2"]
+        ]
+        batch_agents = make_agents(4)
+        round_agents = make_agents(4)
+        
+        payoffs = self.payoff_matrix.attribute_scores_batch(batch_agents, all_round_strategies)
+        for round_strategies in all_round_strategies:
+            self.payoff_matrix.attribute_scores(round_agents, round_strategies)
+        
+        self.assertTrue(np.array_equal(payoffs, [[5, 5, 5, 15], [0, 0, 0, 0], [0, 10, 0, 10]]))
+        self.assertEqual([agent.scores for agent in batch_agents], [agent.scores for agent in round_agents])
+
+
+class TestPublicGoodsGameRound(unittest.TestCase):
+    """
+    Test cases for PublicGoodsGameRound.
+    """
+
+    def setUp(self):
+        """
+        Set up a game with four stub agents.
+        """
+        matrix_data = {
+            "weights": {},
+            "strategies": {"en": {"strategy1": "Contribute", "strategy2": "Free-ride"}},
+            "combinations": {},
+            "matrix": {}
+        }
+        agents = {
+            name: StubAgent(name, reply)
+            for name, reply in [("Alice", "Contribute"), ("Bob", "I will Free-ride"),
+                                ("Carol", "Contribute"), ("Dave", "Free-ride")]
+        }
+        template = _EN_TEMPLATE.read_text(encoding="utf-8")
+        self.game = PublicGoodsFairGame(
+            "Public Goods Game", "en", agents, 1, True, matrix_data, template, [], False,
+            {"contributionCost": 10, "multiplicationFactor": 2.0, "numAgents": 4}
+        )
+
+    def test_run_collects_strategies_concurrently(self):
+        """
+        Test that all agents are prompted at once and strategies keep the agents' order.
+        """
+        StubAgent.peak_in_flight = 0
+        round_strategies = PublicGoodsGameRound(self.game).run()
+
+        self.assertEqual(round_strategies, ["strategy1", "strategy2", "strategy1", "strategy2"])
+        self.assertEqual(self.game.agents["Bob"].last_strategy(), "Free-ride")
+        self.assertEqual(StubAgent.peak_in_flight, 4)
+
+    def test_shared_prompt_creator_matches_fresh_creator(self):
+        """
+        Test that reusing the game's prompt creator gives the same prompts as a new one per call.
+        """
+        game_round = PublicGoodsGameRound(self.game)
+        for phase in ['communicate', 'choose', 'communicate']:
+            for agent in self.game.agents.values():
+                fresh_creator = PublicGoodsPromptCreator(
+                    self.game.language, self.game.prompt_template, self.game.n_rounds,
+                    self.game.n_rounds_known, self.game.payoff_matrix, self.game.public_goods_config
+                )
+                expected = fresh_creator.fill_template(
+                    agent, game_round._get_opponents(agent), game_round.round_number,
+                    self.game.history.rounds, phase
+                )
+                self.assertEqual(game_round.create_prompt(agent, phase), expected)
+        self.assertIs(self.game.prompt_creator, self.game.prompt_creator)
+
+    def test_run_raises_when_circuit_open(self):
+        """
+        Test that an agent whose provider is down fails the round instead of getting
+        an invented strategy.
+        """
+        self.game.agents["Alice"] = UnreachableAgent("Alice")
+        with self.assertRaises(CircuitOpen):
+            PublicGoodsGameRound(self.game).run()
+        self.assertEqual(self.game.agents["Alice"].strategies, [])
+    
+    def test_run_raises_when_agent_times_out(self):
+        """
+        Test that an agent whose provider ran out of time fails the round instead of
+        getting an invented strategy.
+        """
+        self.game.agents["Alice"] = UnreachableAgent("Alice", TimeoutError("TestLLM did not answer."))
+        with self.assertRaises(TimeoutError):
+            PublicGoodsGameRound(self.game).run()
+        self.assertEqual(self.game.agents["Alice"].strategies, [])
+
+    
+    def test_run_raises_for_unsupported_llm_service(self):
+        """
+        Test that an agent configured with an unknown LLM service fails the round with the
+        factory's ValueError.
+        """
+        self.game.agents["Alice"] = Agent("Alice", "UnknownLLM", "None", 0)
+        with self.assertRaises(ValueError):
+            PublicGoodsGameRound(self.game).run()
 
 
 class TestPublicGoodsGameConfig(unittest.TestCase):
@@ -166,35 +422,109 @@ class TestPublicGoodsGameConfig(unittest.TestCase):
     Test cases for Public Goods Game configuration loading.
     """
     
+    @staticmethod
+    def _list_files(directory):
+        """
+        Return the names of the entries in a directory, or an empty set if it is missing.
+        """
+        try:
+            with os.scandir(directory) as entries:
+                return {entry.name for entry in entries}
+        except FileNotFoundError:
+            return set()
+    
+    @classmethod
+    def setUpClass(cls):
+        """
+        List the config and template directories once for all tests.
+        """
+        cls._configs = cls._list_files(_CONFIG_PATH.parent)
+        cls._templates = cls._list_files(_EN_TEMPLATE.parent)
+    
     def test_config_file_exists(self):
         """
         Test that the config file exists and is readable.
         """
-        config_path = Path("resources/config/public_goods_game/public_goods_game_round_known.json")
-        self.assertTrue(config_path.exists(), f"Config file not found at {config_path}")
+        self.assertIn(_CONFIG_PATH.name, self._configs, f"Config file not found at {_CONFIG_PATH}")
     
     def test_template_files_exist(self):
         """
         Test that the template files exist for both languages.
         """
-        en_template = Path("resources/game_templates/public_goods_game_en.txt")
-        vn_template = Path("resources/game_templates/public_goods_game_vn.txt")
-        
-        self.assertTrue(en_template.exists(), f"English template not found at {en_template}")
-        self.assertTrue(vn_template.exists(), f"Vietnamese template not found at {vn_template}")
+        self.assertIn(_EN_TEMPLATE.name, self._templates, f"English template not found at {_EN_TEMPLATE}")
+        self.assertIn(_VN_TEMPLATE.name, self._templates, f"Vietnamese template not found at {_VN_TEMPLATE}")
+
+
+class TestRunTestsListing(unittest.TestCase):
+    """
+    Test that run_tests lists every test method of this module.
+    """
+    
+    def test_listing_matches_test_methods(self):
+        """
+        Test that each TestCase's listed names match the test_ methods it defines.
+        """
+        for name, test_names in TEST_CASES.items():
+            test_case = globals()[name]
+            defined = {attr for attr in dir(test_case) if attr.startswith("test_")}
+            self.assertEqual(set(test_names), defined, f"Test listing of {name} is out of date")
+        listed_cases = set(TEST_CASES)
+        defined_cases = {
+            name for name, obj in globals().items()
+            if isinstance(obj, type) and issubclass(obj, unittest.TestCase) and obj is not unittest.TestCase
+        }
+        self.assertEqual(listed_cases, defined_cases)
+
+
+# Test methods per TestCase class, listed explicitly so run_tests skips the loader's reflection
+_MATRIX_TESTS = (
+    "test_initialization",
+    "test_calculate_payoff_all_contribute",
+    "test_calculate_payoff_none_contribute",
+    "test_calculate_payoff_empty_pool_is_exact",
+    "test_calculate_payoff_solo_contributor",
+    "test_calculate_payoff_two_contributors",
+    "test_calculate_payoff_returns_float",
+    "test_get_weights_for_combination",
+    "test_get_combination_key",
+    "test_contribution_mask",
+    "test_weights_from_mask_rejects_out_of_range_masks",
+    "test_mask_accepts_numpy_integers_and_rejects_bools",
+    "test_attribute_scores",
+    "test_payoff_paths_agree",
+    "test_attribute_scores_batch",
+)
+_ROUND_TESTS = (
+    "test_run_collects_strategies_concurrently",
+    "test_shared_prompt_creator_matches_fresh_creator",
+    "test_run_raises_when_circuit_open",
+    "test_run_raises_when_agent_times_out",
+    "test_run_raises_for_unsupported_llm_service",
+)
+_CONFIG_TESTS = (
+    "test_config_file_exists",
+    "test_template_files_exist",
+)
+_LISTING_TESTS = (
+    "test_listing_matches_test_methods",
+)
+
+TEST_CASES = {
+    "TestPublicGoodsPayoffMatrix": _MATRIX_TESTS,
+    "TestPublicGoodsGameRound": _ROUND_TESTS,
+    "TestPublicGoodsGameConfig": _CONFIG_TESTS,
+    "TestRunTestsListing": _LISTING_TESTS,
+}
 
 
 def run_tests():
     """
     Run all tests and display results.
     """
-    # Create test suite
-    loader = unittest.TestLoader()
+    # Create test suite from the explicit listings
     suite = unittest.TestSuite()
-    
-    # Add test cases
-    suite.addTests(loader.loadTestsFromTestCase(TestPublicGoodsPayoffMatrix))
-    suite.addTests(loader.loadTestsFromTestCase(TestPublicGoodsGameConfig))
+    for name, test_names in TEST_CASES.items():
+        suite.addTests(globals()[name](test_name) for test_name in test_names)
     
     # Run tests
     runner = unittest.TextTestRunner(verbosity=2)
@@ -0,0 +1,97 @@
+"""
+Unit tests for the Retry-After and rate-limit reset parsers of the LLM connectors.
+"""
+
+import sys
+import unittest
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from pathlib import Path
+
+# Running this file directly (python unit_tests/test_rate_limit_parsing.py) bypasses conftest.py
+ROOT = str(Path(__file__).resolve().parent.parent)
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from src.llm_connectors.abstract_connector import _parse_retry_after
+from src.llm_connectors.anthropic_connector import _seconds_until
+from src.llm_connectors.openai_connector import _duration_seconds
+
+
+def _from_now(seconds: float) -> datetime:
+    return datetime.now(timezone.utc) + timedelta(seconds=seconds)
+
+
+class TestParseRetryAfter(unittest.TestCase):
+    """Test the standard Retry-After header: delta-seconds or an HTTP date."""
+
+    def test_delta_seconds(self):
+        self.assertEqual(_parse_retry_after("5"), 5.0)
+        self.assertEqual(_parse_retry_after("1.5"), 1.5)
+
+    def test_negative_delta_clamps_to_zero(self):
+        self.assertEqual(_parse_retry_after("-3"), 0.0)
+
+    def test_http_date(self):
+        wait_time = _parse_retry_after(format_datetime(_from_now(30), usegmt=True))
+        # HTTP dates have a resolution of one second
+        self.assertAlmostEqual(wait_time, 30, delta=1.5)
+
+    def test_past_http_date_clamps_to_zero(self):
+        self.assertEqual(_parse_retry_after(format_datetime(_from_now(-30), usegmt=True)), 0.0)
+
+    def test_missing_or_garbage_value(self):
+        self.assertIsNone(_parse_retry_after(None))
+        self.assertIsNone(_parse_retry_after("soon"))
+        self.assertIsNone(_parse_retry_after(""))
+
+
+class TestDurationSeconds(unittest.TestCase):
+    """Test OpenAI's x-ratelimit-reset-* durations."""
+
+    def test_simple_durations(self):
+        self.assertEqual(_duration_seconds("1s"), 1.0)
+        self.assertAlmostEqual(_duration_seconds("20ms"), 0.02)
+        self.assertEqual(_duration_seconds("2h"), 7200.0)
+
+    def test_compound_durations(self):
+        self.assertEqual(_duration_seconds("6m0s"), 360.0)
+        self.assertAlmostEqual(_duration_seconds("1h2m3.5s"), 3723.5)
+        self.assertAlmostEqual(_duration_seconds("1s500ms"), 1.5)
+
+    def test_missing_or_garbage_value(self):
+        self.assertIsNone(_duration_seconds(None))
+        self.assertIsNone(_duration_seconds(""))
+        self.assertIsNone(_duration_seconds("soon"))
+        self.assertIsNone(_duration_seconds("6m0"))
+        self.assertIsNone(_duration_seconds("5x"))
+        self.assertIsNone(_duration_seconds(" 1s"))
+
+
+class TestSecondsUntil(unittest.TestCase):
+    """Test Anthropic's RFC 3339 anthropic-ratelimit-*-reset timestamps."""
+
+    def test_utc_timestamp_with_z_suffix(self):
+        timestamp = _from_now(30).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+        self.assertAlmostEqual(_seconds_until(timestamp), 30, delta=1)
+
+    def test_timestamp_with_offset(self):
+        timestamp = _from_now(30).astimezone(timezone(timedelta(hours=2))).isoformat()
+        self.assertAlmostEqual(_seconds_until(timestamp), 30, delta=1)
+
+    def test_timestamp_without_offset_is_utc(self):
+        timestamp = _from_now(30).strftime("%Y-%m-%dT%H:%M:%S.%f")
+        self.assertAlmostEqual(_seconds_until(timestamp), 30, delta=1)
+
+    def test_past_timestamp_clamps_to_zero(self):
+        timestamp = _from_now(-30).strftime("%Y-%m-%dT%H:%M:%SZ")
+        self.assertEqual(_seconds_until(timestamp), 0.0)
+
+    def test_missing_or_garbage_value(self):
+        self.assertIsNone(_seconds_until(None))
+        self.assertIsNone(_seconds_until("soon"))
+        self.assertIsNone(_seconds_until("2024-13-45T99:00:00Z"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+"""
+Unit tests for the locked result-number counter of public_goods_game_run.
+"""
+
+import multiprocessing
+import os
+import sys
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
+
+# Running this file directly (python unit_tests/test_result_numbering.py) bypasses conftest.py
+ROOT = str(Path(__file__).resolve().parent.parent)
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import public_goods_game_run
+
+BASE_PATTERN = "results_test_en_4_agents_1_rounds_chatgpt_cost10_r2"
+
+
+def _reserve_numbers(results_path: str, count: int) -> list:
+    """Reserve `count` numbers in a worker process whose results directory is `results_path`."""
+    public_goods_game_run.RESULTS_PATH = Path(results_path)
+    return [public_goods_game_run.next_result_number(BASE_PATTERN) for _ in range(count)]
+
+
+class TestNextResultNumber(unittest.TestCase):
+    """Test seeding, incrementing and locking of the '.<base_pattern>.next' counter file."""
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp_dir.cleanup)
+        self.results_path = Path(self._tmp_dir.name)
+        patcher = mock.patch.object(public_goods_game_run, "RESULTS_PATH", self.results_path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.counter_path = self.results_path / f".{BASE_PATTERN}.next"
+
+    def _touch(self, *names):
+        for name in names:
+            (self.results_path / name).touch()
+
+    def test_empty_directory_starts_at_zero(self):
+        self.assertEqual(public_goods_game_run.next_result_number(BASE_PATTERN), 0)
+        self.assertEqual(self.counter_path.read_text(), "1")
+
+    def test_seeds_from_existing_result_files(self):
+        self._touch(
+            f"{BASE_PATTERN}_0.csv",
+            f"{BASE_PATTERN}_3.csv",
+            f"{BASE_PATTERN}_draft.csv",
+            f"{BASE_PATTERN}_7.json",
+            "results_other_pattern_9.csv",
+        )
+        self.assertEqual(public_goods_game_run.next_result_number(BASE_PATTERN), 4)
+
+    def test_sequential_calls_increment(self):
+        numbers = [public_goods_game_run.next_result_number(BASE_PATTERN) for _ in range(5)]
+        self.assertEqual(numbers, [0, 1, 2, 3, 4])
+
+    def test_counter_is_used_instead_of_scanning(self):
+        self.counter_path.write_text("12")
+        self.assertEqual(public_goods_game_run.next_result_number(BASE_PATTERN), 12)
+        self.assertEqual(self.counter_path.read_text(), "13")
+
+    def test_corrupt_counter_is_reseeded(self):
+        self._touch(f"{BASE_PATTERN}_5.csv")
+        self.counter_path.write_text("not a number")
+        self.assertEqual(public_goods_game_run.next_result_number(BASE_PATTERN), 6)
+
+    def test_missing_counter_is_reseeded(self):
+        public_goods_game_run.next_result_number(BASE_PATTERN)
+        self._touch(f"{BASE_PATTERN}_0.csv", f"{BASE_PATTERN}_1.csv")
+        self.counter_path.unlink()
+        self.assertEqual(public_goods_game_run.next_result_number(BASE_PATTERN), 2)
+
+    def test_existing_file_is_skipped(self):
+        self.counter_path.write_text("2")
+        self._touch(f"{BASE_PATTERN}_2.csv", f"{BASE_PATTERN}_3.csv")
+        self.assertEqual(public_goods_game_run.next_result_number(BASE_PATTERN), 4)
+
+    @unittest.skipIf(public_goods_game_run.fcntl is None, "counter locking requires fcntl")
+    def test_threads_never_share_a_number(self):
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            batches = list(executor.map(
+                lambda _: [public_goods_game_run.next_result_number(BASE_PATTERN) for _ in range(25)],
+                range(8),
+            ))
+        numbers = sorted(number for batch in batches for number in batch)
+        self.assertEqual(numbers, list(range(200)))
+
+    @unittest.skipIf(public_goods_game_run.fcntl is None, "counter locking requires fcntl")
+    def test_processes_never_share_a_number(self):
+        context = multiprocessing.get_context("fork" if hasattr(os, "fork") else "spawn")
+        with ProcessPoolExecutor(max_workers=4, mp_context=context) as executor:
+            batches = list(executor.map(_reserve_numbers, [str(self.results_path)] * 4, [25] * 4))
+        numbers = sorted(number for batch in batches for number in batch)
+        self.assertEqual(numbers, list(range(100)))
+
+
+if __name__ == "__main__":
+    unittest.main()